@@ -1,4 +1,433 @@
 from random import *
+from array import array
+from heapq import heappush, heappop
+from mmap import mmap, ACCESS_READ
+from io import UnsupportedOperation
+import os
+import struct
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from collections.abc import Mapping, MutableMapping
+from itertools import chain, compress
+from collections import OrderedDict, Counter
+from contextvars import ContextVar
+from hashlib import blake2b
+from time import perf_counter
+
+# Directions des passages ouverts d'une cellule dans la représentation compacte
+# (un octet par cellule, indice i*width+j)
+NORTH, SOUTH, WEST, EAST = 1, 2, 4, 8
+
+# Déplacement (ligne, colonne) associé à chaque direction, et direction opposée
+_DIRECTIONS = {(-1, 0): NORTH, (1, 0): SOUTH, (0, -1): WEST, (0, 1): EAST}
+_OPPOSITE   = {NORTH: SOUTH, SOUTH: NORTH, WEST: EAST, EAST: WEST}
+# Main droite : directions à essayer selon l'orientation (à droite, tout droit, à gauche, demi-tour)
+_RIGHT_HAND = {NORTH: (EAST, NORTH, WEST, SOUTH), EAST: (SOUTH, EAST, NORTH, WEST),
+               SOUTH: (WEST, SOUTH, EAST, NORTH), WEST: (NORTH, WEST, SOUTH, EAST)}
+
+def _add_reverse_bits(bits, w):
+    """
+    Complète (sur place) une représentation compacte ne contenant que les bits SOUTH et EAST
+    avec les bits NORTH et WEST correspondants des cellules voisines.
+    Le calcul se fait d'un bloc sur un grand entier (un octet par cellule) plutôt que cellule par cellule.
+    """
+    n = len(bits)
+    x = int.from_bytes(bits, "little")
+    est = x & int.from_bytes(bytes([EAST]) * n, "little")
+    sud = x & int.from_bytes(bytes([SOUTH]) * n, "little")
+    # EAST de la cellule k -> WEST de k+1 : un octet plus loin, un bit plus bas
+    # SOUTH de la cellule k -> NORTH de k+w : w octets plus loin, un bit plus bas
+    x |= (est << 7) | (sud << (8*w - 1))
+    bits[:] = (x & ((1 << 8*n) - 1)).to_bytes(n, "little")
+    return None
+
+
+# Octet -> ses 8 bits, un par octet (bit de poids faible en premier)
+_SPREAD = [bytes((b >> i) & 1 for i in range(8)) for b in range(256)]
+# Tirage 0/1 -> passage ouvert par l'arbre binaire et par Sidewinder
+_BTREE_TABLE      = bytes([SOUTH, EAST]) + bytes(254)
+_SIDEWINDER_TABLE = bytes([EAST, 0]) + bytes(254)
+
+
+def _random_flags(n, rng):
+    """
+    Tire n bits aléatoires en un seul appel au générateur rng.
+
+    Valeur de retour : bytes : n octets valant 0 ou 1.
+    """
+    tirage = rng.getrandbits(n).to_bytes((n+7) // 8, "little")
+    return b"".join(map(_SPREAD.__getitem__, tirage))[:n]
+
+# Octet d'une cellule -> nombre de passages ouverts (degré de la cellule)
+_DEGREE = bytes(bin(b & 15).count("1") for b in range(256))
+# Octet d'une cellule -> 1 si la cellule est un couloir droit horizontal (resp. vertical), 0 sinon
+_STRAIGHT_EW = bytes(b & 15 == WEST | EAST for b in range(256))
+_STRAIGHT_NS = bytes(b & 15 == NORTH | SOUTH for b in range(256))
+# Octet d'une cellule -> 1 si son mur EST (resp. SUD) est présent, 0 sinon
+_WALL_EAST  = bytes(not b & EAST for b in range(256))
+_WALL_SOUTH = bytes(not b & SOUTH for b in range(256))
+
+
+def _wall_mask(bits, h, w):
+    """
+    Masque des murs intérieurs d'un labyrinthe de h x w cellules en représentation compacte :
+    un octet par identifiant de mur (2k : mur EST de la cellule k, 2k+1 : son mur SUD), 1 si le mur est présent.
+    """
+    n = h * w
+    masque = bytearray(2 * n)
+    masque[0::2] = bits.translate(_WALL_EAST)
+    masque[1::2] = bits.translate(_WALL_SOUTH)
+    # la dernière colonne n'a pas de mur EST intérieur, la dernière rangée pas de mur SUD
+    masque[2*(w-1)::2*w] = bytes(h)
+    masque[2*(n-w)+1::2] = bytes(w)
+    return masque
+
+
+def _shuffled(ids, rng):
+    """
+    Permutation aléatoire paresseuse des identifiants de ids (mélange de Fisher-Yates, une position fixée
+    par élément produit) : la copie est un tableau d'entiers, sans tuples, et rien n'est fait pour
+    les éléments qui ne sont pas demandés.
+
+    Paramètres: ids : identifiants (array ou séquence d'entiers), non modifiés.
+                rng : générateur (random.Random).
+
+    Valeur de retour : itérateur des identifiants dans un ordre aléatoire.
+    """
+    tableau = array("q", ids)
+    tirage = rng.random
+    for i in range(len(tableau) - 1, -1, -1):
+        j = int(tirage() * (i + 1))
+        tableau[i], tableau[j] = tableau[j], tableau[i]
+        yield tableau[i]
+
+# Nombre de champs de distances (Maze.distance_field) gardés en cache par labyrinthe
+_FIELDS = 4
+
+# Image : niveaux de gris des murs, des passages et du chemin mis en évidence
+_WALL_GRAY, _FLOOR_GRAY, _PATH_GRAY = 0, 255, 128
+# Image : octet d'une cellule -> code de son passage EST (resp. SUD) : 1 ouvert, 0 muré ; le chemin ajoute 2 et 4
+_IMG_EAST  = bytes(1 if b & EAST else 0 for b in range(256))
+_IMG_SOUTH = bytes(1 if b & SOUTH else 0 for b in range(256))
+
+
+def _png_chunk(tag, data):
+    return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data))
+
+
+# Rendu texte : octet d'une cellule -> code ("o" passage ouvert, "m" mur) -> fragment de dessin
+_EAST_CODES   = bytes(ord("o") if b & EAST else ord("m") for b in range(256))
+_SOUTH_CODES  = bytes(ord("o") if b & SOUTH else ord("m") for b in range(256))
+_CELL_GLYPHS  = {ord("o"): "    ", ord("m"): "   ┃"}
+_FLOOR_GLYPHS = {ord("o"): "   ╋", ord("m"): "━━━╋"}
+
+# Format binaire de Maze.save : signature, version, drapeaux (bit 0 : graine connue), hauteur, largeur,
+# graine, nom du générateur ; puis 2 bits par cellule (bit 0 : passage EST, bit 1 : passage SUD)
+_MAGIC   = b"SAEM"
+_VERSION = 1
+_HEADER  = struct.Struct("<4sBBxxIIQ16s")
+_PACK_CODES   = bytes((1 if b & EAST else 0) | (2 if b & SOUTH else 0) for b in range(256))
+_UNPACK_CODES = bytes((EAST if b & 1 else 0) | (SOUTH if b & 2 else 0) for b in range(256))
+
+
+def _pack_cells(bits):
+    """
+    Réduit la représentation compacte (un octet par cellule) à 2 bits par cellule, 4 cellules par octet.
+    Chaque octet ne garde que ses passages EST et SUD dans ses 2 bits de poids faible, puis les quatre
+    tranches codes[r::4] sont superposées d'un bloc (grands entiers décalés de 2r bits).
+    """
+    codes = bits.translate(_PACK_CODES) + bytes(-len(bits) % 4)
+    paquet = 0
+    for r in range(4):
+        paquet |= int.from_bytes(codes[r::4], "little") << (2*r)
+    return paquet.to_bytes(len(codes) // 4, "little")
+
+
+def _unpack_cells(data, n):
+    """
+    Opération inverse de _pack_cells : retourne n octets portant les bits EST et SUD de chaque cellule.
+    """
+    m = len(data)
+    paquet = int.from_bytes(data, "little")
+    masque = int.from_bytes(b"\x03" * m, "little")
+    codes = bytearray(4 * m)
+    for r in range(4):
+        codes[r::4] = ((paquet >> (2*r)) & masque).to_bytes(m, "little")
+    return codes[:n].translate(_UNPACK_CODES)
+
+
+def _read_header(data):
+    """
+    Lit l'en-tête d'un fichier écrit par Maze.save.
+
+    Valeur de retour : (hauteur, largeur, générateur, graine).
+    """
+    magic, version, drapeaux, h, w, seed, generator = _HEADER.unpack_from(data)
+    assert magic == _MAGIC and version == _VERSION, \
+        f"Erreur lors du chargement : fichier de labyrinthe invalide (signature {magic}, version {version})"
+    return h, w, generator.rstrip(b"\0").decode("utf-8") or None, seed if drapeaux & 1 else None
+
+
+def _make_rng(seed=None, rng=None):
+    """
+    Générateur aléatoire d'une génération : rng s'il est fourni, sinon un random.Random initialisé avec seed
+    (tirée au hasard si elle vaut None, pour pouvoir rejouer la génération).
+
+    Valeur de retour : (rng, seed) : le générateur et la graine à mémoriser (None si rng est fourni sans graine).
+    """
+    if rng is None:
+        if seed is None:
+            seed = getrandbits(64)
+        rng = Random(seed)
+    return rng, seed
+
+
+# Sondes ouvertes (Probe), tous threads et contextes confondus : tant que la liste est vide,
+# les méthodes instrumentées ne mesurent rien
+_PROBES = []
+# Sondes du contexte courant (thread, tâche asyncio) : seules celles-ci reçoivent les mesures
+_CONTEXT_PROBES = ContextVar("probes", default=())
+
+
+def _report(operation, counts, times=None):
+    """
+    Transmet les compteurs et les durées (en secondes) d'une opération à chaque sonde active
+    dans le contexte courant : une sonde ne voit pas les opérations des autres threads ou tâches.
+    """
+    for probe in _CONTEXT_PROBES.get():
+        probe.record(operation, counts, times or {})
+    return None
+
+
+class Probe:
+    """
+    Instrumentation des générateurs, des résolutions et des modifications de murs, utilisée comme
+    gestionnaire de contexte (voir Maze.instrument) :
+
+        with Maze.instrument() as sonde:
+            laby = Maze.gen_wilson(100, 100)
+        print(sonde.counts, sonde.times)
+
+    Les compteurs (clés "operation.compteur") et les durées par phase (clés "operation.phase") sont cumulés
+    dans counts et times ; callback(operation, compteurs, durées) est de plus appelée à la fin de chaque
+    opération mesurée (tableaux de bord). Hors d'un bloc with, les méthodes instrumentées ne testent
+    qu'une liste vide : le coût est négligeable.
+    Une sonde ne mesure que les opérations de son contexte (thread ou tâche asyncio qui a ouvert le bloc with),
+    pas celles des autres threads, par exemple les calculs d'un exécuteur.
+    """
+    def __init__(self, callback=None):
+        """
+        Paramètres: callback : fonction appelée après chaque opération mesurée (None : aucune).
+        """
+        self.callback = callback
+        self.counts = Counter()
+        self.times = Counter()
+
+    def __enter__(self):
+        self._jeton = _CONTEXT_PROBES.set(_CONTEXT_PROBES.get() + (self,))
+        _PROBES.append(self)
+        return self
+
+    def __exit__(self, *exc):
+        _PROBES.remove(self)
+        _CONTEXT_PROBES.reset(self._jeton)
+        return False
+
+    def record(self, operation, counts, times):
+        """
+        Cumule les compteurs et les durées d'une opération, puis appelle callback.
+        """
+        for nom, valeur in counts.items():
+            self.counts[f"{operation}.{nom}"] += valeur
+        for nom, valeur in times.items():
+            self.times[f"{operation}.{nom}"] += valeur
+        if self.callback is not None:
+            self.callback(operation, counts, times)
+        return None
+
+
+class RandomBits:
+    """
+    Source rapide de tirages aléatoires : les octets sont tirés par blocs (un seul appel à rng.getrandbits
+    par bloc) puis distribués un par un, au lieu d'un appel à randint/choice par tirage.
+    """
+    def __init__(self, rng, block=1 << 14):
+        """
+        Paramètres: rng : le générateur (random.Random) qui fournit les blocs.
+                    block : nombre d'octets tirés à la fois.
+        """
+        blocs = iter(lambda: rng.getrandbits(8 * block).to_bytes(block, "little"), None)
+        self.byte = chain.from_iterable(blocs).__next__      # octet aléatoire (0 à 255)
+
+    def below(self, n):
+        """
+        Retourne un entier aléatoire uniforme de 0 à n-1 (1 <= n <= 256).
+        """
+        # les octets au-delà du dernier multiple de n sont rejetés pour ne pas favoriser les petites valeurs
+        limite = 256 - 256 % n
+        b = self.byte()
+        while b >= limite:
+            b = self.byte()
+        return b % n
+
+    def choice(self, seq):
+        """
+        Retourne un élément de seq (au plus 256 éléments) choisi au hasard.
+        """
+        return seq[self.below(len(seq))]
+
+
+class UnionFind:
+    """
+    Structure union-find (ensembles disjoints) sur les entiers 0..n-1,
+    avec compression de chemin et union par rang : chaque opération est en temps quasi constant.
+    Utilisable pour les cellules d'un labyrinthe numérotées i*width+j.
+    """
+    def __init__(self, n):
+        """
+        Crée n classes d'un seul élément.
+        """
+        self.parent = list(range(n))
+        self.rank   = bytearray(n)
+        self.count  = n              # nombre de classes
+
+    def find(self, x):
+        """
+        Retourne le représentant de la classe de x (en compressant le chemin parcouru par « halving »).
+        """
+        parent = self.parent
+        while parent[x] != x:
+            parent[x] = x = parent[parent[x]]
+        return x
+
+    def union(self, x, y):
+        """
+        Fusionne les classes de x et de y.
+
+        Valeur de retour : bool : True si les deux classes étaient distinctes, False sinon.
+        """
+        # find(x) et find(y) recopiés ici : union est appelée dans les boucles des générateurs
+        parent = self.parent
+        while parent[x] != x:
+            parent[x] = x = parent[parent[x]]
+        while parent[y] != y:
+            parent[y] = y = parent[parent[y]]
+        if x == y:
+            return False
+        rank = self.rank
+        if rank[x] < rank[y]:
+            x, y = y, x
+        parent[y] = x
+        if rank[x] == rank[y]:
+            rank[x] += 1
+        self.count -= 1
+        return True
+
+    def connected(self, x, y):
+        """
+        Retourne True si x et y sont dans la même classe.
+        """
+        return self.find(x) == self.find(y)
+
+
+class TreeIndex:
+    """
+    Index d'un labyrinthe parfait (un arbre couvrant) pour répondre aux requêtes de distance
+    et de chemin entre deux cellules sans nouveau parcours.
+    L'arbre est enraciné, la profondeur de chaque cellule est mémorisée ainsi qu'un pointeur de saut
+    vers un de ses ancêtres (sauts « binaires obliques ») : la construction est en O(n)
+    et chaque recherche du plus proche ancêtre commun (LCA) en O(log n).
+    Les cellules sont les indices k = i*width+j.
+    """
+    def __init__(self, maze, root=(0, 0)):
+        """
+        Construit l'index du labyrinthe maze (qui doit être parfait), enraciné en root.
+        """
+        w = maze.width
+        n = maze.height * w
+        bits = maze._bits()
+        assert sum(bits.translate(_DEGREE)) == 2 * (n-1), \
+            "Erreur lors de la construction de l'index : le labyrinthe n'est pas parfait (nombre de passages)"
+        racine = root[0]*w + root[1]
+        parent, ordre, _ = maze._bfs([racine])
+        assert len(ordre) == n, \
+            "Erreur lors de la construction de l'index : le labyrinthe n'est pas parfait (cellules inaccessibles)"
+        depth = array("i", [0]) * n
+        jump = array("i", [racine]) * n
+        #Le parcours en largeur visite chaque parent avant ses enfants
+        for k in ordre[1:]:
+            p = parent[k]
+            depth[k] = depth[p] + 1
+            #Si les deux sauts au-dessus de p sont de même longueur, on les enchaîne ; sinon on saute vers p
+            sp = jump[p]
+            if depth[p] - depth[sp] == depth[sp] - depth[jump[sp]]:
+                jump[k] = jump[sp]
+            else:
+                jump[k] = p
+        self.width  = w
+        self.root   = racine
+        self.parent = parent
+        self.depth  = depth
+        self.jump   = jump
+
+    def _ancestor(self, k, d):
+        """
+        Retourne l'ancêtre de k situé à la profondeur d (d <= profondeur de k).
+        """
+        depth, jump, parent = self.depth, self.jump, self.parent
+        while depth[k] > d:
+            k = jump[k] if depth[jump[k]] >= d else parent[k]
+        return k
+
+    def _lca(self, u, v):
+        depth, jump, parent = self.depth, self.jump, self.parent
+        if depth[u] > depth[v]:
+            u = self._ancestor(u, depth[v])
+        else:
+            v = self._ancestor(v, depth[u])
+        while u != v:
+            if jump[u] != jump[v]:
+                u, v = jump[u], jump[v]
+            else:
+                u, v = parent[u], parent[v]
+        return u
+
+    def lca(self, c1, c2):
+        """
+        Retourne la cellule où se rejoignent les chemins de c1 et de c2 vers la racine.
+        """
+        w = self.width
+        return divmod(self._lca(c1[0]*w + c1[1], c2[0]*w + c2[1]), w)
+
+    def distance(self, c1, c2):
+        """
+        Retourne la distance géodésique (nombre de déplacements) entre c1 et c2.
+        """
+        w = self.width
+        u, v = c1[0]*w + c1[1], c2[0]*w + c2[1]
+        return self.depth[u] + self.depth[v] - 2 * self.depth[self._lca(u, v)]
+
+    def path(self, start, stop):
+        """
+        Retourne le chemin entre start et stop, dans le même ordre que les méthodes solve_*
+        (de l'arrivée jusqu'au départ).
+        """
+        w = self.width
+        u, v = start[0]*w + start[1], stop[0]*w + stop[1]
+        a = self._lca(u, v)
+        parent = self.parent
+        #de stop jusqu'à l'ancêtre commun, puis de l'ancêtre commun jusqu'à start
+        descente, montee = [], []
+        while v != a:
+            descente.append(divmod(v, w))
+            v = parent[v]
+        while u != a:
+            montee.append(divmod(u, w))
+            u = parent[u]
+        montee.append(divmod(a, w))
+        montee.reverse()
+        return descente + montee
+
 
 class Maze:
     """
@@ -18,18 +447,15 @@ class Maze:
         """
         self.height    = height
         self.width     = width
-        self.neighbors = {(i,j): set() for i in range(height) for j in range (width)}
+        self.expanded  = 0         # cellules développées (ou pas effectués) par la dernière résolution (solve_astar, solve_rhr...)
+        self._cache    = {}        # structures calculées à partir des murs (index...), vidé à chaque modification
+        self._observers = []       # objets prévenus des modifications des murs (voir attach)
+        self.generator = None      # nom de l'algorithme de génération (gen_*), None si construit à la main
+        self.seed      = None      # graine aléatoire de la génération, si elle est connue
+        self.fill()
         if empty:
-            for i in range(height):
-                for j in range(width):
-                    if i > 0:
-                        self.neighbors[(i,j)].add(((i-1),j))
-                    if i < height - 1:
-                        self.neighbors[(i,j)].add(((i+1),j))
-                    if j > 0:
-                        self.neighbors[(i,j)].add((i,(j-1)))
-                    if j < width -1:
-                        self.neighbors[(i,j)].add((i,(j+1)))
+            self.empty()
+
     def info(self):
         """
         Affichage des attributs d'un objet 'Maze' (fonction utile pour deboguer)
@@ -46,33 +472,148 @@ class Maze:
         Retour:
              chaîne (str) : chaîne de caractères représentant le labyrinthe
         """
-        txt = ""
+        return "\n".join(self._skeleton()) + "\n"
+
+    def _render_rows(self):
+        """
+        Générateur des lignes du rendu texte du labyrinthe sans contenu (sans retour à la ligne).
+        Chaque ligne est obtenue d'un bloc : les octets d'une rangée de cellules sont traduits en codes,
+        puis chaque code en son fragment de dessin (str.translate).
+        """
+        h, w = self.height, self.width
+        bits = self._bits()
         # Première ligne
-        txt += "┏"
-        for j in range(self.width-1):
-            txt += "━━━┳"
-        txt += "━━━┓\n"
-        txt += "┃"
-        for j in range(self.width-1):
-            txt += "   ┃" if (0,j+1) not in self.neighbors[(0,j)] else "    "
-        txt += "   ┃\n"
-        # Lignes normales
-        for i in range(self.height-1):
-            txt += "┣"
-            for j in range(self.width-1):
-                txt += "━━━╋" if (i+1,j) not in self.neighbors[(i,j)] else "   ╋"
-            txt += "━━━┫\n" if (i+1,self.width-1) not in self.neighbors[(i,self.width-1)] else "   ┫\n"
-            txt += "┃"
-            for j in range(self.width):
-                txt += "   ┃" if (i+1,j+1) not in self.neighbors[(i+1,j)] else "    "
-            txt += "\n"
+        yield "┏" + "━━━┳" * (w-1) + "━━━┓"
+        for i in range(h):
+            rangee = bits[i*w:(i+1)*w]
+            # Cellules de la rangée et leurs murs EST (la dernière cellule n'a jamais de passage EST)
+            yield "┃" + rangee.translate(_EAST_CODES).decode("ascii").translate(_CELL_GLYPHS)
+            # Murs SUD de la rangée
+            if i < h-1:
+                yield "┣" + rangee.translate(_SOUTH_CODES).decode("ascii").translate(_FLOOR_GLYPHS)[:-1] + "┫"
         # Bas du tableau
-        txt += "┗"
-        for i in range(self.width-1):
-            txt += "━━━┻"
-        txt += "━━━┛\n"
+        yield "┗" + "━━━┻" * (w-1) + "━━━┛"
 
-        return txt
+    def _skeleton(self):
+        """
+        Lignes du rendu texte du labyrinthe sans contenu, calculées une seule fois
+        puis gardées en cache tant que les murs ne changent pas (toute modification des voisinages,
+        même sur place, est signalée par _changed).
+        Valeur de retour : list : les 2*height+1 lignes (sans retour à la ligne).
+        """
+        if "render" not in self._cache:
+            self._cache["render"] = list(self._render_rows())
+        return self._cache["render"]
+
+    def _content_rows(self, content):
+        """
+        Regroupe le contenu à afficher par rangée : {i: [(j, caractère), ...]}.
+        Les cellules absentes de content sont vides, les cellules hors du labyrinthe sont ignorées.
+        """
+        par_rangee = {}
+        for (i, j), car in (content or {}).items():
+            if 0 <= i < self.height and 0 <= j < self.width:
+                par_rangee.setdefault(i, []).append((j, car))
+        return par_rangee
+
+    @staticmethod
+    def _place(ligne, cellules):
+        """
+        Place les caractères de cellules [(j, caractère), ...] au milieu de leurs cellules
+        dans une ligne de cellules du rendu sans contenu (la cellule j occupe les caractères 4j+1 à 4j+4).
+        """
+        car = list(ligne)
+        for j, c in cellules:
+            car[4*j + 2] = c
+        return "".join(car)
+
+    def write_image(self, f, cell=4, wall=1, path=None, format="png"):
+        """
+        Écrit une image en niveaux de gris du labyrinthe (murs noirs, passages blancs, chemin en gris)
+        dans le fichier binaire f, au format PNG ou PGM. L'image est produite bande par bande
+        (une rangée de cellules à la fois) : la mémoire utilisée ne dépend que de la largeur.
+        Chaque ligne de pixels est obtenue d'un bloc, comme le rendu texte : les octets d'une rangée de cellules
+        sont traduits en codes, puis chaque code en ses pixels (str.translate).
+
+        Paramètres: f : un fichier ouvert en écriture binaire.
+                    cell : côté d'une cellule en pixels.
+                    wall : épaisseur d'un mur en pixels.
+                    path : chemin à mettre en évidence, liste de cellules consécutives (sortie d'une méthode solve_*).
+                    format : "png" ou "pgm".
+        """
+        assert format in ("png", "pgm"), f"Erreur lors de l'export de l'image : format {format} inconnu"
+        h, w = self.height, self.width
+        largeur, hauteur = w*cell + (w+1)*wall, h*cell + (h+1)*wall
+        bits = self._bits()
+        #Chemin, regroupé par rangée : cellules (code 2) et passages EST empruntés (code 4), passages SUD empruntés
+        path = [c for c in path or () if 0 <= c[0] < h and 0 <= c[1] < w]
+        chemin, chemin_sud = {}, {}
+        for (i, j) in path:
+            chemin.setdefault(i, {})[j] = 2
+        for a, b in zip(path, path[1:]):
+            (i, j), (x, y) = min(a, b), max(a, b)
+            if (x, y) == (i, j+1):
+                chemin[i][j] |= 4
+            elif (x, y) == (i+1, j):
+                chemin_sud.setdefault(i, []).append(j)
+        #Pixels de chaque code : cellule suivie de son mur EST, mur SUD suivi d'un coin
+        gris = lambda n, g: chr(g) * n
+        cellules = {c: gris(cell, _PATH_GRAY if c & 2 else _FLOOR_GRAY)
+                       + gris(wall, _PATH_GRAY if c & 4 else _FLOOR_GRAY if c & 1 else _WALL_GRAY) for c in range(8)}
+        sols = {c: gris(cell, _PATH_GRAY if c & 4 else _FLOOR_GRAY if c & 1 else _WALL_GRAY) + gris(wall, _WALL_GRAY)
+                for c in range(8)}
+        bord = gris(wall, _WALL_GRAY)
+        prefixe = b"\x00" if format == "png" else b""      # PNG : filtre « aucun » en tête de chaque ligne
+        plein = (prefixe + gris(largeur, _WALL_GRAY).encode("latin-1")) * wall
+
+        def bandes():
+            yield plein
+            for i in range(h):
+                rangee = bits[i*w:(i+1)*w]
+                codes = bytearray(rangee.translate(_IMG_EAST))
+                for j, c in chemin.get(i, {}).items():
+                    codes[j] |= c
+                bande = (prefixe + (bord + codes.decode("latin-1").translate(cellules)).encode("latin-1")) * cell
+                if i < h-1:
+                    sud = bytearray(rangee.translate(_IMG_SOUTH))
+                    for j in chemin_sud.get(i, ()):
+                        sud[j] |= 4
+                    bande += (prefixe + (bord + sud.decode("latin-1").translate(sols)).encode("latin-1")) * wall
+                yield bande
+            yield plein
+
+        if format == "pgm":
+            f.write(f"P5\n{largeur} {hauteur}\n255\n".encode("ascii"))
+            for bande in bandes():
+                f.write(bande)
+        else:
+            f.write(b"\x89PNG\r\n\x1a\n")
+            f.write(_png_chunk(b"IHDR", struct.pack(">IIBBBBB", largeur, hauteur, 8, 0, 0, 0, 0)))
+            compresseur = zlib.compressobj()
+            for bande in bandes():
+                donnees = compresseur.compress(bande)
+                if donnees:
+                    f.write(_png_chunk(b"IDAT", donnees))
+            f.write(_png_chunk(b"IDAT", compresseur.flush()))
+            f.write(_png_chunk(b"IEND", b""))
+        return None
+
+    def write(self, f, content=None):
+        """
+        Écrit le rendu texte du labyrinthe (avec le contenu éventuel, comme overlay) ligne par ligne
+        dans le fichier texte f, sans construire la chaîne complète.
+
+        Paramètres: f : un fichier ouvert en écriture (ou tout objet ayant une méthode write).
+                    content (dict) : dictionnaire tq content[cell] contient le caractère à afficher au milieu de la cellule
+        """
+        par_rangee = self._content_rows(content)
+        lignes = self._cache.get("render") or self._render_rows()
+        for n, ligne in enumerate(lignes):
+            if n % 2 == 1 and n // 2 in par_rangee:
+                ligne = self._place(ligne, par_rangee[n // 2])
+            f.write(ligne)
+            f.write("\n")
+        return None
 
     def add_wall(self, c1, c2):
         # Facultatif : on teste si les sommets sont bien dans le labyrinthe
@@ -82,11 +623,69 @@ class Maze:
             0 <= c2[1] < self.width, \
             f"Erreur lors de l'ajout d'un mur entre {c1} et {c2} : les coordonnées de sont pas compatibles avec les dimensions du labyrinthe"
         # Ajout du mur
+        # (set.discard : les NeighborSet ne signalent pas chaque retrait, _changed est appelée une seule fois)
         if c2 in self.neighbors[c1]:      # Si c2 est dans les voisines de c1
-            self.neighbors[c1].remove(c2) # on le retire
+            set.discard(self.neighbors[c1], c2) # on le retire
         if c1 in self.neighbors[c2]:      # Si c3 est dans les voisines de c2
-            self.neighbors[c2].remove(c1) # on le retire
-    
+            set.discard(self.neighbors[c2], c1) # on le retire
+        if _PROBES:
+            _report("add_wall", {"appels": 1})
+        self._changed(c1, c2)
+        return None
+
+    def _changed(self, c1=None, c2=None):
+        """
+        Signale une modification des murs (entre c1 et c2, ou de tout le labyrinthe si c1 vaut None) :
+        les structures calculées à partir des murs (self._cache) ne sont plus valables,
+        et les observateurs (attach) sont prévenus.
+        """
+        self._cache.clear()
+        for observer in self._observers:
+            observer.wall_changed(c1, c2)
+        return None
+
+    def attach(self, observer):
+        """
+        Abonne observer aux modifications des murs : sa méthode wall_changed(c1, c2) sera appelée
+        après chaque add_wall / remove_wall (c1 et c2 valent None si tout le labyrinthe a changé).
+        """
+        self._observers.append(observer)
+        return None
+
+    def detach(self, observer):
+        """
+        Désabonne observer (voir attach).
+        """
+        self._observers.remove(observer)
+        return None
+
+    @staticmethod
+    def instrument(callback=None):
+        """
+        Active l'instrumentation le temps d'un bloc with : appels à add_wall / remove_wall, cellules visitées,
+        tirages aléatoires, empilements et dépilements, durée des phases de gen_wilson (marche, creusement).
+
+        Paramètres: callback : fonction callback(operation, compteurs, durees) appelée après chaque opération mesurée.
+
+        Valeur de retour : Probe : la sonde, dont les attributs counts et times cumulent les mesures.
+        """
+        return Probe(callback)
+
+    @property
+    def neighbors(self):
+        """
+        Dictionnaire cellule -> ensemble des voisines accessibles (LazyNeighbors : seules les cellules
+        modifiées sont stockées, les autres sont déduites de l'état de base, tout muré ou tout ouvert).
+        """
+        return self._neighbors
+
+    @neighbors.setter
+    def neighbors(self, voisinages):
+        # un dictionnaire ordinaire devient l'ensemble des cellules modifiées d'un labyrinthe muré
+        if not isinstance(voisinages, LazyNeighbors):
+            voisinages = LazyNeighbors(self, opened=False, edited=voisinages)
+        self._neighbors = voisinages
+        self._changed()
 
     def fill(self):
         """
@@ -94,13 +693,14 @@ class Maze:
         Les voisins sont stockés sous forme d'un dictionnaire où chaque clé représente un tuple (i, j) 
         qui correspond aux coordonnées d'une cellule dans une matrice de dimensions height x width. 
         La valeur associée à chaque clé est un ensemble vide.
+        Le dictionnaire est implicite (LazyNeighbors) : la remise à zéro est en temps constant.
 
         Paramètres: Aucun
 
         Valeurs de retour: None: Cette fonction ne renvoie rien. 
         Elle met simplement à jour l'attribut "neighbors" de l'objet qui l'appelle.
         """
-        self.neighbors = {(i,j): set() for i in range(self.height) for j in range (self.width)}               
+        self.neighbors = LazyNeighbors(self, opened=False)
         return None
 
 
@@ -132,8 +732,11 @@ class Maze:
             0 <= c2[1] < self.width, \
             f"Erreur lors de la suppression d'un mur entre {c1} et {c2} : les coordonnées de sont pas compatibles avec les dimensions du labyrinthe"
         if c2 not in self.neighbors[c1]:      # Si c2 est dans les voisines de c1
-            self.neighbors[c1].add(c2)
-            self.neighbors[c2].add(c1)         # on le retire
+            set.add(self.neighbors[c1], c2)   # (set.add : _changed est appelée une seule fois, plus bas)
+            set.add(self.neighbors[c2], c1)
+        if _PROBES:
+            _report("remove_wall", {"appels": 1})
+        self._changed(c1, c2)
         return None
 
 
@@ -143,22 +746,15 @@ class Maze:
         Pour chaque cellule de la grille, la fonction ajoute tous les voisins possibles 
         (cellules adjacentes) dans le dictionnaire de voisins de cette cellule.
         
+        Le dictionnaire est implicite (LazyNeighbors) : l'opération est en temps constant.
+
         Paramètres: self (obj): L'instance de la classe contenant les attributs de grille à utiliser.
 
         Variables: Aucune.
             
         Valeurs de retour: None: Cette fonction ne renvoie rien.
         """
-        for i in range(self.height):
-                for j in range(self.width):
-                    if i > 0:
-                        self.neighbors[(i,j)].add(((i-1),j))
-                    if i < self.height - 1:
-                        self.neighbors[(i,j)].add(((i+1),j))
-                    if j > 0:
-                        self.neighbors[(i,j)].add((i,(j-1)))
-                    if j < self.width -1:
-                        self.neighbors[(i,j)].add((i,(j+1)))              
+        self.neighbors = LazyNeighbors(self, opened=True)
         return None
 
 
@@ -174,13 +770,43 @@ class Maze:
         Valeurs de retour: Une liste de tuples(mark), chaque tuple représentant un mur entre deux cellules de la grille.
         Les éléments de chaque tuple sont des tuples de coordonnées (i, j), où i est la ligne et j est la colonne.   
         """
-        mark=[]
-        for c1 in self.neighbors.keys():
-            if c1[1] < self.width-1 and (c1[0],c1[1]+1) not in self.neighbors[c1]:
-                mark.append((c1,(c1[0],c1[1]+1)))
-            if c1[0] < self.height-1 and (c1[0]+1,c1[1]) not in self.neighbors[c1]:
-                mark.append((c1,(c1[0]+1,c1[1])))           
-        return mark
+        return list(self.iter_walls())
+
+    def wall_ids(self):
+        """
+        Forme compacte de get_walls : les murs intérieurs présents, numérotés comme dans gen_fusion
+        (2k : mur EST de la cellule k = i*width+j, 2k+1 : son mur SUD), dans l'ordre de get_walls.
+
+        Valeur de retour : array('q') : les identifiants des murs (8 octets par mur, sans tuples).
+        """
+        return array("q", compress(range(2 * self.height * self.width), _wall_mask(self._bits(), self.height, self.width)))
+
+    def iter_walls(self):
+        """
+        Forme paresseuse de get_walls : les murs sont produits un par un, sans construire de liste.
+
+        Valeur de retour : itérateur des couples de cellules (c1, c2) séparées par un mur.
+        """
+        masque = _wall_mask(self._bits(), self.height, self.width)
+        return map(self.wall_cells, compress(range(len(masque)), masque))
+
+    def wall_cells(self, wall):
+        """
+        Retourne le couple de cellules (c1, c2) séparées par le mur d'identifiant wall (voir wall_ids).
+        """
+        i, j = divmod(wall >> 1, self.width)
+        return ((i, j), (i+1, j)) if wall & 1 else ((i, j), (i, j+1))
+
+    def shuffled_walls(self, seed=None, rng=None):
+        """
+        Flux des identifiants des murs présents (voir wall_ids) dans un ordre aléatoire, mélangés à la demande :
+        pour un algorithme de type Kruskal qui s'arrête avant d'avoir tout parcouru, ou un export aléatoire.
+
+        Paramètres: seed, rng : graine ou générateur (random.Random) du mélange.
+
+        Valeur de retour : itérateur d'identifiants de murs (wall_cells les convertit en cellules).
+        """
+        return _shuffled(self.wall_ids(), _make_rng(seed, rng)[0])
 
     def get_contiguous_cells(self, c):
         """
@@ -220,8 +846,9 @@ class Maze:
         adjacentes à c dans la grille qui sont également accessibles à partir de c.
         """
         reachable=[]
+        voisins = self.neighbors.peek(c)
         for c1 in self.get_contiguous_cells(c):
-            if c1 in self.neighbors[c]:
+            if c1 in voisins:
                 reachable.append(c1)
         return reachable
 
@@ -234,265 +861,645 @@ class Maze:
         
         return cells
 
+    def _bits(self):
+        """
+        Représentation compacte des passages du labyrinthe.
+
+        Valeur de retour : bytearray : un octet par cellule (indice i*width+j), combinaison des bits
+        NORTH, SOUTH, WEST et EAST des passages ouverts depuis cette cellule.
+        Elle est gardée en cache jusqu'à la prochaine modification des murs (à ne pas modifier).
+        """
+        if "bits" in self._cache:
+            return self._cache["bits"]
+        w = self.width
+        bits = self.neighbors.base_bits()
+        for (i, j), voisins in self.neighbors.edited.items():
+            b = 0
+            for (x, y) in voisins:
+                b |= _DIRECTIONS.get((x-i, y-j), 0)
+            bits[i*w + j] = b
+        self._cache["bits"] = bits
+        return bits
+
+    def _load_bits(self, bits):
+        """
+        Remplace les passages du labyrinthe par ceux décrits dans la représentation compacte bits
+        (voir _bits). Les octets servent d'état de base aux voisinages : aucun ensemble n'est construit,
+        seules les cellules modifiées ensuite en auront un.
+        """
+        self.neighbors = LazyNeighbors(self, base=bytes(bits))
+        return None
+
+    @classmethod
+    def from_bits(cls, height, width, bits):
+        """
+        Construit un labyrinthe à partir de sa représentation compacte (voir _bits).
+
+        Paramètres: height : Hauteur du labyrinthe.
+                    width: Largeur du labyrinthe.
+                    bits: Un octet par cellule décrivant ses passages ouverts.
+
+        Valeur de retour : Une instance de la classe appelante.
+        """
+        assert len(bits) == height * width, \
+            f"Erreur lors du chargement : {len(bits)} octets pour un labyrinthe de {height} x {width}"
+        laby = cls(height, width, empty=False)
+        laby._load_bits(bits)
+        return laby
+
+
+    def save(self, path):
+        """
+        Enregistre le labyrinthe dans un fichier binaire compact : un en-tête (_HEADER : signature, version,
+        hauteur, largeur, graine, générateur) suivi de 2 bits par cellule (passages EST et SUD),
+        4 cellules par octet dans l'ordre des indices k = i*width+j.
+
+        Paramètres: path : chemin du fichier à écrire.
+        """
+        seed = self.seed if isinstance(self.seed, int) and 0 <= self.seed < 2**64 else None
+        entete = _HEADER.pack(_MAGIC, _VERSION, seed is not None, self.height, self.width,
+                              seed or 0, (self.generator or "").encode("utf-8")[:16])
+        with open(path, "wb") as f:
+            f.write(entete)
+            f.write(_pack_cells(self._bits()))
+        return None
 
     @classmethod
-    def gen_btree(cls, h, w):
+    def load(cls, path, lazy=False):
+        """
+        Charge un labyrinthe enregistré avec save.
+
+        Paramètres: path : chemin du fichier à lire.
+                    lazy : si False (par défaut), le fichier est lu entièrement dans une instance de la classe appelante.
+                           Si True, il est projeté en mémoire (mmap) et lu à la demande : l'ouverture est immédiate
+                           quelle que soit sa taille, et le labyrinthe (MappedMaze) est en lecture seule ;
+                           il se ferme avec close() ou en l'utilisant dans un bloc with.
+
+        Valeur de retour : Le labyrinthe chargé.
+        """
+        if lazy:
+            return MappedMaze(path)
+        with open(path, "rb") as f:
+            data = f.read()
+        h, w, generator, seed = _read_header(data)
+        bits = bytearray(_unpack_cells(data[_HEADER.size:], h * w))
+        _add_reverse_bits(bits, w)
+        laby = cls.from_bits(h, w, bits)
+        laby.generator, laby.seed = generator, seed
+        return laby
+
+    @classmethod
+    def generate_many(cls, algorithm, h, w, count, seed=None, workers=None):
+        """
+        Génère count labyrinthes de h x w cellules en parallèle sur un ensemble de processus.
+        La graine de chaque labyrinthe est tirée d'un générateur initialisé avec seed : pour une même graine,
+        le résultat est identique quel que soit le nombre de processus.
+
+        Paramètres: algorithm : nom de l'algorithme ("btree", "sidewinder", "eller", "fusion", "exploration", "wilson").
+                    h : Hauteur des labyrinthes.
+                    w: Largeur des labyrinthes.
+                    count : nombre de labyrinthes.
+                    seed : graine de la série (None : aléatoire).
+                    workers : nombre de processus (None : un par cœur ; 1 : dans le processus courant).
+
+        Valeur de retour : list : pour chaque labyrinthe, sa représentation compacte (bytes, voir _bits),
+                           à passer à from_bits pour obtenir un objet Maze.
+        """
+        assert hasattr(cls, "gen_" + algorithm), f"Erreur lors de la génération : algorithme {algorithm} inconnu"
+        graines = Random(seed)
+        taches = [(algorithm, h, w, graines.getrandbits(64)) for _ in range(count)]
+        if workers == 1:
+            return [_generate_one(tache) for tache in taches]
+        workers = workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(workers) as executor:
+            return list(executor.map(_generate_one, taches, chunksize=max(1, count // (4 * workers))))
+
+    @classmethod
+    def from_rows(cls, h, w, rows):
+        """
+        Construit un labyrinthe à partir des h premières lignes d'un flux stream_* .
+
+        Paramètres: h : Hauteur du labyrinthe.
+                    w: Largeur du labyrinthe.
+                    rows: Itérable de lignes de w octets (bits SOUTH et EAST de chaque cellule).
+
+        Valeur de retour : Une instance de la classe appelante.
+        """
+        bits = bytearray()
+        for i, row in zip(range(h), rows):
+            bits += row
+        _add_reverse_bits(bits, w)
+        return cls.from_bits(h, w, bits)
+
+    @staticmethod
+    def stream_btree(w, h=None, seed=None, rng=None):
+        """
+        Génère, ligne par ligne, un labyrinthe avec l'algorithme de l'arbre binaire
+        (mémoire en O(w) : aucune ligne n'est conservée après avoir été produite).
+
+        Paramètres: w: Largeur du labyrinthe.
+                    h : Hauteur du labyrinthe, ou None pour un flux sans fin.
+                    seed, rng : graine ou générateur (random.Random) des tirages aléatoires.
+
+        Valeur de retour : Générateur de lignes (bytes de w octets) : pour chaque cellule,
+        les bits SOUTH et EAST des passages ouverts vers le bas et vers la droite.
+        Par exemple : for row in Maze.stream_btree(w, h): f.write(row)
+        """
+        rng = _make_rng(seed, rng)[0]
+        i = 0
+        while h is None or i < h-1:
+            #Pour chaque cellule, supprimer aléatoirement le mur EST ou le mur SUD : tous les tirages
+            #de la ligne d'un coup, traduits d'un bloc (la dernière colonne n'a que le mur SUD)
+            row = bytearray(_random_flags(w, rng).translate(_BTREE_TABLE))
+            row[w-1] = SOUTH
+            yield bytes(row)
+            i += 1
+        #Dernière ligne : seul le mur EST existe, on le supprime partout
+        if h:
+            yield bytes([EAST]) * (w-1) + bytes(1)
+
+    @staticmethod
+    def stream_sidewinder(w, h=None, seed=None, rng=None):
+        """
+        Génère, ligne par ligne, un labyrinthe avec l'algorithme Sidewinder (mémoire en O(w)).
+
+        Paramètres: w: Largeur du labyrinthe.
+                    h : Hauteur du labyrinthe, ou None pour un flux sans fin.
+                    seed, rng : graine ou générateur (random.Random) des tirages aléatoires.
+
+        Valeur de retour : Générateur de lignes (bytes de w octets, bits SOUTH et EAST de chaque cellule).
+        """
+        rng = _make_rng(seed, rng)[0]
+        i = 0
+        while h is None or i < h-1:
+            #Tous les pile ou face de la ligne d'un coup, comme gen_sidewinder : 0 casse le mur EST,
+            #1 termine la séquence (la dernière cellule termine toujours la séquence)
+            fins = bytearray(_random_flags(w, rng))
+            fins[w-1] = 1
+            row = bytearray(fins.translate(_SIDEWINDER_TABLE))
+            #Pour chaque séquence, casser le mur SUD d’une de ses cellules choisie au hasard
+            debut = 0
+            for longueur in map(len, fins.split(b"\x01")[:-1]):
+                row[debut + int(rng.random() * (longueur+1))] |= SOUTH
+                debut += longueur + 1
+            yield bytes(row)
+            i += 1
+        #Casser tous les murs EST de la dernière ligne
+        if h:
+            yield bytes([EAST]) * (w-1) + bytes(1)
+
+    @staticmethod
+    def stream_eller(w, h=None, seed=None, rng=None):
+        """
+        Génère, ligne par ligne, un labyrinthe avec l'algorithme d'Eller (mémoire en O(w)).
+        Chaque cellule de la ligne courante appartient à un ensemble ; deux cellules voisines d'ensembles
+        différents peuvent être reliées, et chaque ensemble descend au moins une fois vers la ligne suivante.
+        La dernière ligne relie tous les ensembles restants : pour un flux sans fin (h=None),
+        le labyrinthe n'est parfait qu'une fois refermé.
+
+        Paramètres: w: Largeur du labyrinthe.
+                    h : Hauteur du labyrinthe, ou None pour un flux sans fin.
+                    seed, rng : graine ou générateur (random.Random) des tirages aléatoires.
+
+        Valeur de retour : Générateur de lignes (bytes de w octets, bits SOUTH et EAST de chaque cellule).
+        """
+        rng = _make_rng(seed, rng)[0]
+        #ensemble de chaque colonne, et colonnes de chaque ensemble
+        ensembles = list(range(w))
+        membres = {s: [s] for s in range(w)}
+        prochain = w
+        i = 0
+        while h is None or i < h:
+            derniere = h is not None and i == h-1
+            row = bytearray(w)
+            #Pile ou face de la ligne tirés d'un coup : liaisons EST, puis descentes
+            relier = bytes(w) if derniere else _random_flags(w, rng)
+            #Relier aléatoirement des cellules voisines d'ensembles différents (toutes sur la dernière ligne)
+            for j in range(w-1):
+                a, b = ensembles[j], ensembles[j+1]
+                if a != b and (derniere or relier[j]):
+                    row[j] = EAST
+                    if len(membres[a]) < len(membres[b]):
+                        a, b = b, a
+                    for c in membres[b]:
+                        ensembles[c] = a
+                    membres[a] += membres.pop(b)
+            if not derniere:
+                #Chaque ensemble descend par au moins une de ses cellules
+                descendre = _random_flags(w, rng)
+                for cols in membres.values():
+                    descentes = [c for c in cols if descendre[c]] or [rng.choice(cols)]
+                    for c in descentes:
+                        row[c] |= SOUTH
+                #Les cellules qui ne descendent pas commencent un nouvel ensemble sur la ligne suivante
+                membres = {}
+                for j in range(w):
+                    if not row[j] & SOUTH:
+                        ensembles[j] = prochain
+                        prochain += 1
+                    membres.setdefault(ensembles[j], []).append(j)
+            yield bytes(row)
+            i += 1
+
+    @classmethod
+    def gen_btree(cls, h, w, seed=None, rng=None):
         """
         Cette fonction génère un labyrinthe en utilisant l'algorithme de l'arbre binaire.
 
         Paramètres: h : Hauteur du labyrinthe.
                     w: Largeur du labyrinthe.
+                    seed, rng : graine ou générateur (random.Random) des tirages aléatoires ;
+                                la graine utilisée est mémorisée dans l'attribut seed du labyrinthe.
         
         Variables: Aucune.
 
-        Valeurs de retour: La fonction retourne une instance de labyrinthe générée avec l'algorithme de l'arbre binaire.
+        Valeur de retour : La fonction retourne une instance de labyrinthe générée avec l'algorithme de l'arbre binaire.
         """
-        #Initialisation : un labyrinthe plein (contenant tous les murs possibles) Pour chaque cellule du labyrinthe :
-        #Supprimer aléatoirement le mur EST ou le mur SUD (s’il n’en possède qu’un, supprimer ce mur ; s’il n’en possède aucun des deux, ne rien faire)
-        laby = cls(h, w, empty=False)
-        for i in range(h-1):
-            for j in range(w-1):
-                res = randint(0,1)
-                #supprime le mur EST si on est pas sur la derniere colonne
-                if res == 0 and i < h-1:
-                    laby.remove_wall((i,j),(i+1,j))
-                #supprime le mur SUD si on est pas sur la derniere ligne
-                elif res == 1 and j < w-1:
-                    laby.remove_wall((i,j),(i,j+1))
-                else:
-                    continue
-        for x in range(0, w):
-            if x+1 < w:
-                laby.remove_wall((x, w-1), (x+1, w-1))
-        for y in range(0, h):
-            if y+1 < h :
-                laby.remove_wall((h-1, y), (h-1, y+1))
+        rng, seed = _make_rng(seed, rng)
+        #Les tirages de chaque cellule sont indépendants : ils sont tous faits d'un coup
+        #(un bit aléatoire par cellule), puis traduits en passages EST ou SUD d'un bloc
+        n = h * w
+        bits = bytearray(_random_flags(n, rng).translate(_BTREE_TABLE))
+        #La dernière colonne n'a que le mur SUD, la dernière ligne que le mur EST
+        bits[w-1::w] = bytes([SOUTH]) * h
+        bits[n-w:] = bytes([EAST]) * (w-1) + bytes(1)
+        _add_reverse_bits(bits, w)
+        laby = cls.from_bits(h, w, bits)
+        laby.generator = "btree"
+        laby.seed = seed
         return laby
 
     @classmethod
-    def gen_sidewinder(cls, h, w):
+    def gen_sidewinder(cls, h, w, seed=None, rng=None):
         """
         Cette fonction génère un labyrinthe en utilisant l'algorithme Sidewinder.
 
         Paramètres: h : Hauteur du labyrinthe.
                     w: Largeur du labyrinthe.
+                    seed, rng : graine ou générateur (random.Random) des tirages aléatoires ;
+                                la graine utilisée est mémorisée dans l'attribut seed du labyrinthe.
 
-        Valeurs de retour: La fonction retourne une instance de labyrinthe générée avec l'algorithme Sidewinder.
+        Valeur de retour : La fonction retourne une instance de labyrinthe générée avec l'algorithme Sidewinder.
         """
-        #Initialisation : création d’un labyrinthe plein
-        laby = cls(h, w, empty=False)
-        #Pour i allant de 0 à hauteur-2 :
-        for i in range(h-1):
-            #Initialiser une variable séquence comme liste vide
-            sequence=[]
-            #Pour j allant de 0 à largeur-2 :
-            for j in range(w-1):
-                #Ajouter la cellule (i, j) à la séquence
-                sequence.append((i,j))
-
-                #Tirer à pile ou face :
-                res = randint(0,1)
-
-                #Si c’est pile : Casser le mur EST de la cellule (i, j)
-                if res == 0:
-                    laby.remove_wall((i,j),(i,j+1))
-
-                 #Si c’est face :
-                else:
-                    #Casser le mur SUD d’une des cellules (choisie au hasard) qui constituent le séquence qui vient d’être terminée.
-                    cell = choice(sequence)
-                    laby.remove_wall((cell[0], cell[1]), (cell[0]+1, cell[1]))
-
-                    #Réinitialiser la séquence à une liste vide
-                    sequence = []
+        rng, seed = _make_rng(seed, rng)
+        #Tous les pile ou face d'un coup : 1 termine la séquence, 0 casse le mur EST
+        #(la dernière colonne termine toujours la séquence)
+        n = h * w
+        fins = bytearray(_random_flags(n, rng))
+        fins[w-1::w] = bytes([1]) * h
+        bits = bytearray(fins.translate(_SIDEWINDER_TABLE))
+        #Pour chaque séquence terminée, casser le mur SUD d'une de ses cellules choisie au hasard
+        #(découpage d'un bloc : chaque morceau est une séquence sans sa cellule de fin)
+        debut = 0
+        for longueur in map(len, fins[:n-w].split(b"\x01")[:-1]):
+            bits[debut + int(rng.random() * (longueur+1))] |= SOUTH
+            debut += longueur + 1
+        #Casser tous les murs EST de la dernière ligne
+        bits[n-w:] = bytes([EAST]) * (w-1) + bytes(1)
+        _add_reverse_bits(bits, w)
+        laby = cls.from_bits(h, w, bits)
+        laby.generator = "sidewinder"
+        laby.seed = seed
+        return laby
 
-            #Ajouter la dernière cellule à la séquence
-            sequence.append((i, w-1))
+    @classmethod
+    def gen_eller(cls, h, w, seed=None, rng=None):
+        """
+        Cette fonction génère un labyrinthe en utilisant l'algorithme d'Eller.
 
-            #Tirer une cellule au sort dans la séquence et casser son mur SUD
-            randCell = choice(sequence)
-            laby.remove_wall((randCell[0], randCell[1]), (randCell[0]+1, randCell[1]))
+        Paramètres: h : Hauteur du labyrinthe.
+                    w: Largeur du labyrinthe.
+                    seed, rng : graine ou générateur (random.Random) des tirages aléatoires ;
+                                la graine utilisée est mémorisée dans l'attribut seed du labyrinthe.
 
-        #Casser tous les murs EST de la dernière ligne
-        for y in range(0, h):
-            if y+1 < h :
-                laby.remove_wall((h-1, y), (h-1, y+1))
-        #Retourner le labyrinthe
+        Valeur de retour : La fonction retourne une instance de labyrinthe générée avec l'algorithme d'Eller.
+        """
+        rng, seed = _make_rng(seed, rng)
+        laby = cls.from_rows(h, w, cls.stream_eller(w, h, rng=rng))
+        laby.generator = "eller"
+        laby.seed = seed
         return laby
 
     @classmethod
-    def gen_fusion(cls, h, w):
+    def gen_fusion(cls, h, w, seed=None, rng=None):
         """
         Cette fonction génère un labyrinthe n utilisant l'algorithme de génération de labyrinthe par fusion.
 
         Paramètres : h : Hauteur du labyrinthe.
                     w: Largeur du labyrinthe.
+                    seed, rng : graine ou générateur (random.Random) des tirages aléatoires ;
+                                la graine utilisée est mémorisée dans l'attribut seed du labyrinthe.
 
         Valeur de retour : La fonction retourne une instance de labyrinthe générée avec l'algorithme de fusion.
 
         laby : un objet Labyrinth représentant le labyrinthe généré.
         """
-        #Initialisation : création d’un labyrinthe plein
-        laby = cls(h, w, empty=False)
-
-        #on labélise les cellules de 1 à n
-        compteur = 1
-        labelle_cellule = {}
-        for i in laby.neighbors.keys():
-            labelle_cellule[i] = compteur
-            compteur+=1
-
-        #on extrait la liste de tous les murs et on les « mélange » (on les permute aléatoirement)
-        walls = laby.get_walls()
-        shuffle(walls)
-
-        #Si les deux cellules séparées par le mur n’ont pas le même label :
-        for tupleWall in walls:
-            if labelle_cellule[tupleWall[0]] != labelle_cellule[tupleWall[1]]:
-                laby.remove_wall(tupleWall[0], tupleWall[1])
-                
-                #affecter le label de l’une des deux cellules, à l’autre, et à toutes celles qui ont le même label que la deuxième
-                sameLabel = []
-                for cell in labelle_cellule.keys():
-                    if labelle_cellule[cell] == labelle_cellule[tupleWall[1]]:
-                        sameLabel.append(cell)
-                for cell in sameLabel:
-                    labelle_cellule[cell] = labelle_cellule[tupleWall[0]]               
-
+        rng, seed = _make_rng(seed, rng)
+        #Initialisation : un labyrinthe plein, en représentation compacte (un octet par cellule)
+        n = h * w
+        bits = bytearray(n)
+
+        #on numérote les murs (2k : mur EST de la cellule k, 2k+1 : son mur SUD) et on les « mélange » à la demande
+        walls = array("q", compress(range(2 * n), _wall_mask(bits, h, w)))
+
+        #chaque cellule a d'abord son propre label : une classe par cellule
+        labels = UnionFind(n)
+        for wall in _shuffled(walls, rng):
+            #le labyrinthe est parfait dès que toutes les cellules ont le même label
+            if labels.count == 1:
+                break
+            k = wall >> 1
+            if wall & 1:
+                voisine, d = k + w, SOUTH
+            else:
+                voisine, d = k + 1, EAST
+            #Si les deux cellules séparées par le mur n’ont pas le même label :
+            #casser le mur et fusionner les deux labels
+            if labels.union(k, voisine):
+                bits[k] |= d
+                bits[voisine] |= _OPPOSITE[d]
+
+        if _PROBES:
+            _report("gen_fusion", {"murs": len(walls), "murs_casses": n - labels.count})
+        laby = cls.from_bits(h, w, bits)
+        laby.generator = "fusion"
+        laby.seed = seed
         return laby
 
     @classmethod
-    def gen_exploration(cls, h, w):
+    def gen_exploration(cls, h, w, seed=None, rng=None):
         """
         Cette fonction génère un labyrinthe en utilisant l’algorithme d’exploration exhaustive
 
         Paramètres: h : Hauteur du labyrinthe.
                     w: Largeur du labyrinthe.
+                    seed, rng : graine ou générateur (random.Random) des tirages aléatoires ;
+                                la graine utilisée est mémorisée dans l'attribut seed du labyrinthe.
 
         Valeur de retour : La fonction retourne une instance de labyrinthe générée avec l'algorithme d’exploration exhaustive.
         """
-        #Initialisation : création d’un labyrinthe plein
-        laby = cls(h, w, empty=False)
-
-        #Choisir une cellule au hasard
-        randomCell = choice(list(laby.neighbors.keys()))
-
-        #Marquer cette cellule comme étant visitée
-        estVisiter = [randomCell]
-
-        #Mettre cette cellule sur une pile
-        pile = [randomCell]
+        rng, seed = _make_rng(seed, rng)
+        #Initialisation : un labyrinthe plein, en représentation compacte (un octet par cellule k = i*w+j)
+        n = h * w
+        bits = bytearray(n)
+        estVisiter = bytearray(n)
+
+        #Choisir une cellule au hasard, la marquer comme visitée et la mettre sur une pile
+        tirages = RandomBits(rng)
+        #Instrumentation (Maze.instrument) : les octets aléatoires consommés (rejets de below compris)
+        #sont comptés par une enveloppe de tirages.byte, la boucle reste inchangée sans sonde active
+        sonde = bool(_PROBES)
+        if sonde:
+            octets = [0]
+            def compter(tirer=tirages.byte):
+                octets[0] += 1
+                return tirer()
+            tirages.byte = compter
+        k = rng.randrange(n)
+        estVisiter[k] = 1
+        pile = [k]
 
         #Tant que la pile n’est pas vide :
-        while len(pile) != 0: 
+        while pile:
 
-            #Prendre la cellule en haut de la pile et l’en retirer
-            currentCell = pile[0]
-            del pile[0]
+            #Prendre la cellule en haut de la pile
+            k = pile[-1]
 
-            #Prendre les cellules contigues de la cellule actuelle et si elle sont pas visitées, les mettres dans une liste.
+            #Prendre les cellules contigues de la cellule actuelle qui ne sont pas visitées
             notVisited = []
-            for cell in laby.get_contiguous_cells(currentCell):
-                if cell not in estVisiter:
-                    notVisited.append(cell)
-            
+            if k >= w and not estVisiter[k-w]:
+                notVisited.append((k-w, NORTH))
+            if k < n-w and not estVisiter[k+w]:
+                notVisited.append((k+w, SOUTH))
+            j = k % w
+            if j > 0 and not estVisiter[k-1]:
+                notVisited.append((k-1, WEST))
+            if j < w-1 and not estVisiter[k+1]:
+                notVisited.append((k+1, EAST))
+
             #Si cette cellule a des voisins qui n’ont pas encore été visités :
             if notVisited:
 
-                #La remettre sur la pile
-                pile.insert(0, currentCell)
-
                 #Choisir au hasard l’une de ses cellules contigües qui n’a pas été visitée
-                contiguousNotVisited = choice(notVisited)
-
-                #Casser le mur entre la cellule (celle qui a été dépilée) et celle qui vient d’être choisie
-                laby.remove_wall(currentCell, contiguousNotVisited)
-                laby.remove_wall(contiguousNotVisited, currentCell)
+                #et casser le mur entre les deux cellules
+                v, d = tirages.choice(notVisited)
+                bits[k] |= d
+                bits[v] |= _OPPOSITE[d]
 
                 #Marquer la cellule qui vient d’être choisie comme visitée et la mettre sur la pile
-                estVisiter.append(contiguousNotVisited)
-                pile.insert(0, contiguousNotVisited)
+                estVisiter[v] = 1
+                pile.append(v)
 
+            #Sinon, la retirer de la pile
+            else:
+                pile.pop()
+
+        if sonde:
+            #les cellules marquées sont celles qui ont été empilées (une seule fois chacune),
+            #chaque empilement après le premier casse un mur, et la pile finit vide
+            empilees = estVisiter.count(1)
+            _report("gen_exploration", {"cellules_visitees": empilees, "empilements": empilees,
+                                        "depilements": empilees - len(pile), "tirages": octets[0],
+                                        "murs_casses": empilees - 1})
+        laby = cls.from_bits(h, w, bits)
+        laby.generator = "exploration"
+        laby.seed = seed
         return laby
 
     @classmethod
-    def gen_wilson(cls, h, w):
+    def gen_wilson(cls, h, w, seed=None, rng=None):
         """
         Cette fonction génère un labyrinthe en utilisant l’algorithme de Wilson
 
         Paramètres: h : Hauteur du labyrinthe.
                     w: Largeur du labyrinthe.
+                    seed, rng : graine ou générateur (random.Random) des tirages aléatoires ;
+                                la graine utilisée est mémorisée dans l'attribut seed du labyrinthe.
 
         Valeur de retour : La fonction retourne une instance de labyrinthe générée avec l'algorithme de Wilson.
         """
-        #Initialisation : création d’un labyrinthe plein
-        laby = cls(h, w, empty=False)
+        rng, seed = _make_rng(seed, rng)
+        #Initialisation : un labyrinthe plein, en représentation compacte (un octet par cellule k = i*w+j)
+        n = h * w
+        bits = bytearray(n)
+        mark = bytearray(n)
+        #Direction prise en quittant chaque cellule lors de la dernière marche aléatoire :
+        #en écrasant la direction à chaque passage, les boucles sont effacées d'elles-mêmes
+        suivant = bytearray(n)
+        pas = {NORTH: -w, SOUTH: w, WEST: -1, EAST: 1}
+        direction = rng.getrandbits
+        #Instrumentation (Maze.instrument) : les tirages et les pas de marche sont comptés par une enveloppe
+        #de direction, qui suit sa propre copie de la position (ici) ; la boucle de marche reste donc
+        #inchangée quand aucune sonde n'est active
+        sonde = bool(_PROBES)
+        if sonde:
+            tirages, pas_faits, ici, marches, casses, durees = [0], [0], [0], 0, 0, Counter()
+            def direction(nb, tirer=rng.getrandbits):
+                tirages[0] += 1
+                d = tirer(nb)
+                k = ici[0]
+                #même règle que la marche : une direction qui sort de la grille ne fait pas de pas
+                if d == 0:
+                    v = k - w if k >= w else -1
+                elif d == 1:
+                    v = k + w if k < n-w else -1
+                elif d == 2:
+                    v = k - 1 if k % w else -1
+                else:
+                    v = k + 1 if k % w != w-1 else -1
+                if v != -1:
+                    pas_faits[0] += 1
+                    ici[0] = v
+                return d
+        #Cellules non marquées (tirage en O(1)) et position de chaque cellule dans cette liste
+        nonMarquees = list(range(n))
+        position = list(range(n))
+
+        def marquer(k):
+            #retrait en O(1) : la dernière cellule de la liste prend la place de k
+            mark[k] = 1
+            derniere = nonMarquees.pop()
+            if derniere != k:
+                nonMarquees[position[k]] = derniere
+                position[derniere] = position[k]
+
         #Choisir une cellule au hasard sur la grille et la marquer
-        randomCell = choice(laby.get_cells())
-        mark = {randomCell}
+        marquer(rng.randrange(n))
         #Tant qu’il reste des cellules non marquées :
-        while len(mark) != len(laby.get_cells()):
+        while nonMarquees:
             #Choisir une cellule de départ au hasard, parmi les cellules non marquées
-            startCell = choice(list(set(laby.get_cells()) - mark))
+            depart = k = nonMarquees[rng.randrange(len(nonMarquees))]
+            if sonde:
+                marches += 1
+                ici[0] = depart
+                debut = perf_counter()
             #Effectuer une marche aléatoire jusqu’à ce qu’une cellule marquée soit atteinte
-            path = [startCell]
-            while startCell not in mark:
-                startCell = choice(laby.get_contiguous_cells(startCell))
-                if startCell in path:
-                    path = path[:path.index(startCell)+1]
-                else:
-                    path.append(startCell)
-            #Marquer chaque cellule du chemin, et casser tous les murs rencontrés, jusqu’à la cellule marquée
-            for j in range(len(path)-1):
-                laby.remove_wall(path[j], path[j+1])
-            mark.update(path)
-        print(laby)
+            #(une direction qui sort de la grille est simplement tirée à nouveau)
+            while not mark[k]:
+                d = direction(2)
+                if d == 0:
+                    if k >= w:
+                        suivant[k] = NORTH
+                        k -= w
+                elif d == 1:
+                    if k < n-w:
+                        suivant[k] = SOUTH
+                        k += w
+                elif d == 2:
+                    if k % w:
+                        suivant[k] = WEST
+                        k -= 1
+                elif k % w != w-1:
+                    suivant[k] = EAST
+                    k += 1
+            if sonde:
+                durees["marche"] += perf_counter() - debut
+                restantes = len(nonMarquees)
+                debut = perf_counter()
+            #Marquer chaque cellule du chemin (sans ses boucles), et casser tous les murs rencontrés, jusqu’à la cellule marquée
+            k = depart
+            while not mark[k]:
+                d = suivant[k]
+                v = k + pas[d]
+                bits[k] |= d
+                bits[v] |= _OPPOSITE[d]
+                marquer(k)
+                k = v
+            if sonde:
+                durees["creusement"] += perf_counter() - debut
+                casses += restantes - len(nonMarquees)
+
+        if sonde:
+            #un tirage hors de la grille est tiré à nouveau sans faire de pas ;
+            #les pas qui n'ont pas été creusés ont été effacés avec les boucles
+            _report("gen_wilson", {"marches": marches, "tirages": tirages[0], "pas": pas_faits[0],
+                                   "murs_casses": casses, "effacements": pas_faits[0] - casses,
+                                   "cellules_visitees": n - len(nonMarquees)}, durees)
+
+        laby = cls.from_bits(h, w, bits)
+        laby.generator = "wilson"
+        laby.seed = seed
         return laby
 
     def overlay(self, content=None):
         """
         Rendu en mode texte, sur la sortie standard, 
         d'un labyrinthe avec du contenu dans les cellules
+        Seules les rangées contenant du contenu sont recalculées : le reste vient du rendu sans contenu en cache.
         Argument:
             content (dict) : dictionnaire tq content[cell] contient le caractère à afficher au milieu de la cellule
+                             (une cellule absente est vide)
         Retour:
             string
         """
-        if content is None:
-            content = {(i,j):' ' for i in range(self.height) for j in range(self.width)}
-        else:
-            # Python >=3.9
-            #content = content | {(i, j): ' ' for i in range(
-            #    self.height) for j in range(self.width) if (i,j) not in content}
-            # Python <3.9
-            new_content = {(i, j): ' ' for i in range(self.height) for j in range(self.width) if (i,j) not in content}
-            content = {**content, **new_content}
-        txt = r""
-        # Première ligne
-        txt += "┏"
-        for j in range(self.width-1):
-            txt += "━━━┳"
-        txt += "━━━┓\n"
-        txt += "┃"
-        for j in range(self.width-1):
-            txt += " "+content[(0,j)]+" ┃" if (0,j+1) not in self.neighbors[(0,j)] else " "+content[(0,j)]+"  "
-        txt += " "+content[(0,self.width-1)]+" ┃\n"
-        # Lignes normales
-        for i in range(self.height-1):
-            txt += "┣"
-            for j in range(self.width-1):
-                txt += "━━━╋" if (i+1,j) not in self.neighbors[(i,j)] else "   ╋"
-            txt += "━━━┫\n" if (i+1,self.width-1) not in self.neighbors[(i,self.width-1)] else "   ┫\n"
-            txt += "┃"
-            for j in range(self.width):
-                txt += " "+content[(i+1,j)]+" ┃" if (i+1,j+1) not in self.neighbors[(i+1,j)] else " "+content[(i+1,j)]+"  "
-            txt += "\n"
-        # Bas du tableau
-        txt += "┗"
-        for i in range(self.width-1):
-            txt += "━━━┻"
-        txt += "━━━┛\n"
-        return txt
+        lignes = list(self._skeleton())
+        for i, cellules in self._content_rows(content).items():
+            lignes[2*i + 1] = self._place(lignes[2*i + 1], cellules)
+        return "\n".join(lignes) + "\n"
+
+    def _path(self, pred, k):
+        """
+        Reconstruit le chemin menant à la cellule d'indice k à partir du tableau des prédécesseurs
+        (une source est sa propre prédécesseure).
+
+        Valeur de retour : pathCell (list): les coordonnées du chemin, de k jusqu'à la source.
+        """
+        w = self.width
+        pathCell = [divmod(k, w)]
+        #Tant que c n’est pas une source : mettre le prédécesseur de c dans c et l'ajouter au chemin
+        while pred[k] != k:
+            k = pred[k]
+            pathCell.append(divmod(k, w))
+        return pathCell
+
+    def _bfs(self, sources, targets=()):
+        """
+        Parcours en largeur sur les indices k = i*width+j des cellules, depuis une ou plusieurs sources,
+        qui s'arrête dès que l'une des cellules cibles est atteinte.
+
+        Paramètres: sources : indices des cellules de départ.
+                    targets : indices des cellules d'arrivée (aucune : parcours complet).
+
+        Valeur de retour : (pred, file, cible) :
+                    pred (array) : prédécesseur de chaque cellule (-1 si non atteinte, elle-même pour une source),
+                    file (list) : les cellules atteintes, dans l'ordre du parcours (la dernière est la plus éloignée),
+                    cible (int) : la cible atteinte, -1 si aucune.
+        """
+        w = self.width
+        n = self.height * w
+        bits = self._bits()
+        pred = array("i", [-1]) * n
+        estCible = bytearray(n)
+        for k in targets:
+            estCible[k] = 1
+        file = []
+        for k in sources:
+            if pred[k] == -1:
+                pred[k] = k
+                file.append(k)
+        #La file est une liste lue de gauche à droite ; les cellules ajoutées pendant la lecture sont lues à leur tour
+        for k in file:
+            if estCible[k]:
+                if _PROBES:
+                    _report("bfs", {"enfilements": len(file), "defilements": file.index(k) + 1,
+                                    "cellules_visitees": len(file)})
+                return pred, file, k
+            b = bits[k]
+            if b & NORTH and pred[k-w] == -1:
+                pred[k-w] = k
+                file.append(k-w)
+            if b & SOUTH and pred[k+w] == -1:
+                pred[k+w] = k
+                file.append(k+w)
+            if b & WEST and pred[k-1] == -1:
+                pred[k-1] = k
+                file.append(k-1)
+            if b & EAST and pred[k+1] == -1:
+                pred[k+1] = k
+                file.append(k+1)
+        if _PROBES:
+            _report("bfs", {"enfilements": len(file), "defilements": len(file), "cellules_visitees": len(file)})
+        return pred, file, -1
 
     def solve_dfs(self, start, stop):
         """
@@ -504,152 +1511,326 @@ class Maze:
 
         Valeur de retour : pathCell (list): La liste de coordonnées représentant le chemin entre les deux cellules.
         """
-        #Placer D dans la struture d’attente (file ou pile) et marquer D
-        pile=[start]
-        mark=[start]
-        #Mémoriser l’élément prédécesseur de D comme étant D
-        pred={start : start}
-        nbCell = len(self.get_cells())
-        #Tant qu’il reste des cellules non-marquées :
-        while len(mark) != nbCell:
-            #Prendre la « première » cellule et la retirer de la structure (appelons c, cette cellule)
-            cell = pile.pop()
-            #Si c correspond à A :
-            if cell == stop:
-                #C’est terminé, on a trouvé un chemin vers la cellule de destination
+        w = self.width
+        bits = self._bits()
+        depart, arrivee = start[0]*w + start[1], stop[0]*w + stop[1]
+        #Placer D dans la pile et le marquer : D est son propre prédécesseur
+        #(une cellule est marquée dès que son prédécesseur est connu)
+        pred = array("i", [-1]) * (self.height * w)
+        pred[depart] = depart
+        pile = [depart]
+        #Tant que la pile n'est pas vide :
+        while pile:
+            #Prendre la cellule du haut de la pile et la retirer (appelons c, cette cellule)
+            k = pile.pop()
+            #Si c correspond à A : c’est terminé, on a trouvé un chemin vers la cellule de destination
+            if k == arrivee:
                 break
-            #Sinon
-            else:
-                #Pour chaque voisine de c :
-                for neighbor in self.get_reachable_cells(cell):
-                    #Si elle n’est pas marquée :
-                    if neighbor not in mark:
-                        #La marquer
-                        mark.append(neighbor)
-                        #La mettre dans la structure d’attente
-                        pile.append(neighbor)
-                        #Mémoriser son prédécesseur comme étant c
-                        pred[neighbor] = cell
+            #Sinon, pour chaque voisine de c non marquée : la marquer, mémoriser son prédécesseur et l'empiler
+            b = bits[k]
+            for d, v in ((NORTH, k-w), (SOUTH, k+w), (WEST, k-1), (EAST, k+1)):
+                if b & d and pred[v] == -1:
+                    pred[v] = k
+                    pile.append(v)
+        if _PROBES:
+            #les cellules marquées sont celles qui ont été empilées ; celles qui restent n'ont pas été dépilées
+            empilees = len(pred) - pred.count(-1)
+            _report("solve_dfs", {"empilements": empilees, "depilements": empilees - len(pile),
+                                  "cellules_visitees": empilees})
+        assert pred[arrivee] != -1, f"Erreur lors de la résolution : {stop} n'est pas accessible depuis {start}"
         # Reconstruction du chemin à partir des prédécesseurs
-        pathCell = []
-        #Initialiser c à A
-        cell = stop
-        #Tant que c n’est pas D :
-        while cell != start:
-            #ajouter c au chemin
-            pathCell.append(cell)
-            #mettre le prédécesseur de c dans c
-            cell = pred[cell]
-        #Ajouter D au chemin
-        pathCell.append(start)
-        return pathCell
+        return self._path(pred, arrivee)
+
+    def solve_bfs(self, start, stop):
+        """
+        Cette fonction renvoie le plus court chemin reliant deux cellules du labyrinthe en utilisant l'algorithme de parcours en largeur BFS.
+        Le parcours s'arrête dès que la cellule d'arrivée est atteinte.
+
+        Paramètres: self (Labyrinth): Instance du labyrinthe.
+                    start (tuple): Coordonnées de la cellule de départ.
+                    stop (tuple ou list): Coordonnées de la cellule d'arrivée, ou liste de cellules d'arrivée
+                                          (le chemin mène alors à la plus proche d'entre elles).
 
-    def solve_bfs(self,start, stop):
+        Valeur de retour : pathCell (list): La liste de coordonnées représentant le chemin entre les deux cellules
+                           (de l'arrivée jusqu'au départ).
         """
-        Cette fonction renvoie le chemin reliant deux cellules du labyrinthe en utilisant l'algorithme de parcours en largeur BFS.
+        w = self.width
+        if isinstance(stop[0], int):
+            stop = [stop]
+        pred, file, cible = self._bfs([start[0]*w + start[1]], [c[0]*w + c[1] for c in stop])
+        assert cible != -1, f"Erreur lors de la résolution : aucune des cellules {stop} n'est accessible depuis {start}"
+        return self._path(pred, cible)
+
+    def solve_astar(self, start, stop):
+        """
+        Cette fonction renvoie le plus court chemin reliant deux cellules du labyrinthe avec l'algorithme A*,
+        guidé par la distance de Manhattan (distance_man) jusqu'à l'arrivée.
+        Le nombre de cellules développées est rangé dans l'attribut expanded.
 
         Paramètres: self (Labyrinth): Instance du labyrinthe.
                     start (tuple): Coordonnées de la cellule de départ.
                     stop (tuple): Coordonnées de la cellule d'arrivée.
 
-        Valeur de retour : pathCell (list): La liste de coordonnées représentant le chemin entre les deux cellules.
+        Valeur de retour : pathCell (list): La liste de coordonnées représentant le chemin entre les deux cellules
+                           (de l'arrivée jusqu'au départ).
         """
-        #Placer D dans la struture d’attente (file ou pile) et marquer D
-        pile=[start]
-        mark=[start]
-        #Mémoriser l’élément prédécesseur de D comme étant D
-        pred={start : start}
-        nbCell = len(self.get_cells())
-        #Tant qu’il reste des cellules non-marquées :
-        while len(mark) != nbCell:
-            #Prendre la « première » cellule et la retirer de la structure (appelons c, cette cellule)
-            cell = pile.pop()
-            #Si c correspond à A :
-            if cell == stop:
-                #C’est terminé, on a trouvé un chemin vers la cellule de destination
+        w = self.width
+        n = self.height * w
+        bits = self._bits()
+        depart, arrivee = start[0]*w + start[1], stop[0]*w + stop[1]
+        #g : longueur du meilleur chemin connu depuis le départ, pred : prédécesseur sur ce chemin
+        g = array("i", [-1]) * n
+        pred = array("i", [-1]) * n
+        ferme = bytearray(n)
+        g[depart] = 0
+        pred[depart] = depart
+        #Le tas est ordonné par f = g + distance de Manhattan jusqu'à l'arrivée
+        tas = [(self.distance_man(start, stop), depart)]
+        self.expanded = 0
+        while tas:
+            f, k = heappop(tas)
+            if ferme[k]:
+                continue
+            ferme[k] = 1
+            self.expanded += 1
+            if k == arrivee:
                 break
-            #Sinon
+            b = bits[k]
+            for d, v in ((NORTH, k-w), (SOUTH, k+w), (WEST, k-1), (EAST, k+1)):
+                if b & d and not ferme[v] and (g[v] == -1 or g[k] + 1 < g[v]):
+                    g[v] = g[k] + 1
+                    pred[v] = k
+                    heappush(tas, (g[v] + self.distance_man(divmod(v, w), stop), v))
+        if _PROBES:
+            _report("solve_astar", {"cellules_developpees": self.expanded})
+        assert pred[arrivee] != -1, f"Erreur lors de la résolution : {stop} n'est pas accessible depuis {start}"
+        return self._path(pred, arrivee)
+
+    def solve_bidir(self, start, stop):
+        """
+        Cette fonction renvoie le plus court chemin reliant deux cellules du labyrinthe avec un parcours en largeur
+        bidirectionnel : deux parcours partent du départ et de l'arrivée et s'arrêtent dès qu'ils se rencontrent.
+        Le côté dont la frontière est la plus petite avance d'un niveau complet à chaque tour.
+        Le nombre de cellules développées est rangé dans l'attribut expanded.
+
+        Paramètres: self (Labyrinth): Instance du labyrinthe.
+                    start (tuple): Coordonnées de la cellule de départ.
+                    stop (tuple): Coordonnées de la cellule d'arrivée.
+
+        Valeur de retour : pathCell (list): La liste de coordonnées représentant le chemin entre les deux cellules
+                           (de l'arrivée jusqu'au départ).
+        """
+        w = self.width
+        n = self.height * w
+        bits = self._bits()
+        depart, arrivee = start[0]*w + start[1], stop[0]*w + stop[1]
+        #Pour chaque sens : prédécesseur, distance et frontière (dernier niveau atteint)
+        predD, predA = array("i", [-1]) * n, array("i", [-1]) * n
+        distD, distA = array("i", [-1]) * n, array("i", [-1]) * n
+        predD[depart], predA[arrivee] = depart, arrivee
+        distD[depart], distA[arrivee] = 0, 0
+        frontD, frontA = [depart], [arrivee]
+        self.expanded = 0
+        rencontre = depart if depart == arrivee else -1
+        while rencontre == -1 and frontD and frontA:
+            if len(frontD) <= len(frontA):
+                pred, dist, autre, front = predD, distD, distA, frontD
+            else:
+                pred, dist, autre, front = predA, distA, distD, frontA
+            suivants = []
+            meilleur = -1
+            for k in front:
+                self.expanded += 1
+                b = bits[k]
+                for d, v in ((NORTH, k-w), (SOUTH, k+w), (WEST, k-1), (EAST, k+1)):
+                    if b & d and pred[v] == -1:
+                        pred[v] = k
+                        dist[v] = dist[k] + 1
+                        suivants.append(v)
+                        #Rencontre avec l'autre parcours : on garde la plus courte du niveau
+                        if autre[v] != -1 and (meilleur == -1 or dist[v] + autre[v] < dist[meilleur] + autre[meilleur]):
+                            meilleur = v
+            rencontre = meilleur
+            if front is frontD:
+                frontD = suivants
             else:
-                #Pour chaque voisine de c :
-                for neighbor in self.get_reachable_cells(cell):
-                    #Si elle n’est pas marquée :
-                    if neighbor not in mark:
-                        #La marquer
-                        mark.append(neighbor)
-                        #La mettre dans la structure d’attente
-                        pile.append(neighbor)
-                        #Mémoriser son prédécesseur comme étant c
-                        pred[neighbor] = cell
+                frontA = suivants
+        if _PROBES:
+            _report("solve_bidir", {"cellules_developpees": self.expanded})
+        assert rencontre != -1, f"Erreur lors de la résolution : {stop} n'est pas accessible depuis {start}"
+        #Chemin : de l'arrivée jusqu'à la rencontre, puis de la rencontre jusqu'au départ
+        versArrivee = self._path(predA, rencontre)
+        versArrivee.reverse()
+        return versArrivee + self._path(predD, rencontre)[1:]
+
+    def follow_wall(self, start, stop):
+        """
+        Marche « main droite » (suivi de mur) de start jusqu'à stop, cellule par cellule :
+        seules la position et l'orientation sont mémorisées (mémoire constante).
+        À chaque pas, on tourne à droite si c'est possible, sinon tout droit, sinon à gauche, sinon demi-tour.
 
-        # Reconstruction du chemin à partir des prédécesseurs
-        pathCell = []
-        #Initialiser c à A
-        cell = stop
-        #Tant que c n’est pas D :
-        while cell != start:
-            #ajouter c au chemin
-            pathCell.append(cell)
-            #mettre le prédécesseur de c dans c
-            cell = pred[cell]
-        #Ajouter D au chemin
-        pathCell.append(start)
-        return pathCell
-    
-    #Pour l'algorithme de la main droite, voilà jusqu'ou je suis arrivé, j'arrive à récupéré chaque cellule de droite puis d'en bas etc... mais en cas de cul-de-sac je ne vois pas
-    #comment retourner en arrière. J'avais bien comme idée de créer une liste pointage et à chaque fois qu'on arrivait à un carrefour, rajouter la cellule à la liste et en cas de 
-    #cul-de-sac revenir sur ce pointage et condamné le chemin emprunté, mais je ne vois pas comment l'implémenter.
-
-    """
-    def solve_rhr(self, start, stop):
-        #initialiser le chemin à start
-        chemin = [start]
-        culDeSac = []
-        cell = chemin[0]
-        marquee = [cell]
-        pointage = []
-        while len(chemin) != len(self.get_cells()):
-        for i in range(20):
-            c = self.get_coord(cell)
-            if self.get_reachable_cells(cell) not in culDeSac:
-                if len(self.get_reachable_cells(cell)) >= 2:
-                        pointage.append(cell)
-
-                if (c[0], c[1]-1) in self.get_reachable_cells(cell) and (c[0], c[1]-1) not in culDeSac and (c[0], c[1]-1) not in marquee: #Pour aller sur la case de gauche
-                    cell = (c[0], c[1]-1)
-                    marquee.append(cell)
-                    
-                    print("je passe dans le premier", marquee, cell)
-
-                elif (c[0]+1, c[1]) in self.get_reachable_cells(cell) and (c[0]+1, c[1]) not in culDeSac and (c[0]+1, c[1]) not in marquee: #Pour aller sur la case d'en bas
-                    
-                    cell = (c[0]+1, c[1])
-                    marquee.append(cell)
-                    print("je passe dans le deuxième", marquee, cell, pointage)
-
-                elif (c[0], c[1]+1) in self.get_reachable_cells(cell) and (c[0], c[1]+1) not in culDeSac and (c[0], c[1]+1) not in marquee: #Pour aller sur la case de droite
-                    
-                    cell = (c[0], c[1]+1)
-                    marquee.append(cell)
-                    print("je passe dans le troisième", marquee, cell)
-
-                elif (c[0]-1, c[1]) in self.get_reachable_cells(cell) and (c[0]-1, c[1]) not in culDeSac and (c[0]-1, c[1]) not in marquee: #Pour aller sur la case en haut
-                    
-                    cell = (c[0]-1, c[1])
-                    marquee.append(cell)
-                    print("je passe dans le quatrième", marquee, cell)
+        Paramètres: start (tuple): Coordonnées de la cellule de départ.
+                    stop (tuple): Coordonnées de la cellule d'arrivée.
+
+        Valeur de retour : itérateur des indices k = i*width+j des cellules parcourues, de start à stop inclus.
+        Une erreur est levée si la marche revient à son état initial sans atteindre stop
+        (stop inaccessible, ou sur une « île » que le mur suivi n'atteint pas).
+        """
+        w = self.width
+        bits = self._bits()
+        pas = {NORTH: -w, SOUTH: w, WEST: -1, EAST: 1}
+        depart, arrivee = start[0]*w + start[1], stop[0]*w + stop[1]
+        k, cap = depart, NORTH
+        premier = None          # état (cellule, orientation) après le premier pas
+        yield k
+        while k != arrivee:
+            b = bits[k]
+            for d in _RIGHT_HAND[cap]:
+                if b & d:
+                    break
+            else:
+                assert False, f"Erreur lors de la résolution : la cellule {start} n'a aucun passage"
+            k, cap = k + pas[d], d
+            #la marche est périodique : retrouver l'état du premier pas, c'est tourner en rond
+            assert (k, cap) != premier, \
+                f"Erreur lors de la résolution : {stop} n'est pas atteint en suivant le mur depuis {start}"
+            if premier is None:
+                premier = (k, cap)
+            yield k
+
+    def solve_rhr(self, start, stop, raw=False):
+        """
+        Cette fonction renvoie le chemin reliant deux cellules du labyrinthe en suivant le mur de droite (follow_wall).
+        Le nombre de pas de la marche est rangé dans l'attribut expanded.
+
+        Paramètres: self (Labyrinth): Instance du labyrinthe.
+                    start (tuple): Coordonnées de la cellule de départ.
+                    stop (tuple): Coordonnées de la cellule d'arrivée.
+                    raw (bool): True pour la marche complète (allers-retours dans les culs-de-sac compris),
+                                False pour le chemin sans boucles.
 
+        Valeur de retour : pathCell (list): La liste de coordonnées représentant le chemin entre les deux cellules
+                           (de l'arrivée jusqu'au départ).
+        """
+        w = self.width
+        chemin = []
+        position = {}           # cellule -> sa place dans le chemin (effacement des boucles)
+        self.expanded = -1
+        for k in self.follow_wall(start, stop):
+            self.expanded += 1
+            if raw:
+                chemin.append(k)
+            elif k in position:
+                #retour sur une cellule déjà sur le chemin : la boucle (ou l'aller-retour du cul-de-sac) est effacée
+                for v in chemin[position[k] + 1:]:
+                    del position[v]
+                del chemin[position[k] + 1:]
+            else:
+                position[k] = len(chemin)
+                chemin.append(k)
+        if _PROBES:
+            _report("solve_rhr", {"pas": self.expanded})
+        chemin.reverse()
+        return [divmod(k, w) for k in chemin]
+
+    def solve_tremaux(self, start, stop):
+        """
+        Cette fonction renvoie le chemin reliant deux cellules du labyrinthe avec l'algorithme de Trémaux :
+        chaque passage est marqué à chaque traversée ; on ne traverse jamais un passage marqué deux fois.
+        En arrivant dans une cellule :
+        - si aucun autre passage n'est marqué, on en prend un non marqué ;
+        - sinon, si le passage par lequel on arrive n'est marqué qu'une fois, on fait demi-tour ;
+        - sinon on prend le passage le moins marqué.
+        Le chemin est formé des passages marqués une seule fois. Le nombre de pas est rangé dans l'attribut expanded.
+
+        Valeur de retour : pathCell (list): La liste de coordonnées représentant le chemin entre les deux cellules
+                           (de l'arrivée jusqu'au départ).
+        """
+        w = self.width
+        bits = self._bits()
+        pas = {NORTH: -w, SOUTH: w, WEST: -1, EAST: 1}
+        depart, arrivee = start[0]*w + start[1], stop[0]*w + stop[1]
+        #marques des passages, numérotés comme dans gen_fusion (2k : passage EST de k, 2k+1 : passage SUD de k)
+        marques = bytearray(2 * self.height * w)
+        passage = lambda k, d: 2*k if d == EAST else 2*k + 1 if d == SOUTH else 2*(k-1) if d == WEST else 2*(k-w) + 1
+        k, entree = depart, 0   # entree : direction qui ramène à la cellule précédente (0 au départ)
+        self.expanded = 0
+        while k != arrivee:
+            b = bits[k]
+            autres = [d for d in (NORTH, SOUTH, WEST, EAST) if b & d and d != entree]
+            if entree and autres and any(marques[passage(k, d)] for d in autres) and marques[passage(k, entree)] == 1:
+                choix = [entree]        # cellule déjà visitée par un autre passage : demi-tour
             else:
-                culDeSac+=marquee
-                while marquee[:-1] != pointage[:-1]:
-                    
-                    print(marquee.pop())
-                    marquee.pop()
-                    pointage.pop()
-                print("je passe dans le else", marquee, len(marquee)-1, cell, culDeSac, pointage)
-        print(marquee, ",",culDeSac)
-        chemin += marquee    
-        return chemin
-    """                
+                choix = [d for d in autres if marques[passage(k, d)] < 2] or [entree] * bool(entree)
+            choix = [d for d in choix if marques[passage(k, d)] < 2]
+            assert choix, f"Erreur lors de la résolution : {stop} n'est pas accessible depuis {start}"
+            d = min(choix, key=lambda d: marques[passage(k, d)])
+            marques[passage(k, d)] += 1
+            k, entree = k + pas[d], _OPPOSITE[d]
+            self.expanded += 1
+        #Chemin : passages marqués une seule fois, de l'arrivée jusqu'au départ
+        chemin = [arrivee]
+        precedente = -1
+        while k != depart:
+            b = bits[k]
+            for d in (NORTH, SOUTH, WEST, EAST):
+                if b & d and marques[passage(k, d)] == 1 and k + pas[d] != precedente:
+                    break
+            precedente, k = k, k + pas[d]
+            chemin.append(k)
+        if _PROBES:
+            _report("solve_tremaux", {"pas": self.expanded})
+        return [divmod(k, w) for k in chemin]
+
+    def solve_dead_end_filling(self, start, stop):
+        """
+        Cette fonction renvoie le chemin reliant deux cellules du labyrinthe en comblant les culs-de-sac :
+        chaque impasse (autre que start et stop) est murée, ce qui peut créer de nouvelles impasses, jusqu'à ce
+        qu'il n'en reste plus. Dans un labyrinthe parfait, les cellules restantes forment exactement le chemin ;
+        sinon le plus court chemin est cherché parmi elles. Le nombre de cellules comblées est rangé dans l'attribut expanded.
+
+        Valeur de retour : pathCell (list): La liste de coordonnées représentant le chemin entre les deux cellules
+                           (de l'arrivée jusqu'au départ).
+        """
+        w = self.width
+        pas = {NORTH: -w, SOUTH: w, WEST: -1, EAST: 1}
+        depart, arrivee = start[0]*w + start[1], stop[0]*w + stop[1]
+        masque = bytearray(self._bits())
+        degres = masque.translate(_DEGREE)
+        impasses = [k for k in range(len(masque)) if degres[k] == 1 and k != depart and k != arrivee]
+        self.expanded = 0
+        for k in impasses:
+            d = masque[k] & 15
+            if _DEGREE[d] != 1:
+                continue            # déjà isolée (deux impasses qui se rejoignent)
+            v = k + pas[d]
+            masque[k] &= ~d
+            masque[v] &= ~_OPPOSITE[d]
+            self.expanded += 1
+            if _DEGREE[masque[v]] == 1 and v != depart and v != arrivee:
+                impasses.append(v)
+        if _PROBES:
+            _report("solve_dead_end_filling", {"cellules_comblees": self.expanded})
+        reste = BitMaze.from_bits(self.height, w, masque)
+        pred, _, cible = reste._bfs([depart], [arrivee])
+        assert cible != -1, f"Erreur lors de la résolution : {stop} n'est pas accessible depuis {start}"
+        return reste._path(pred, arrivee)
+
+    def build_index(self, root=(0, 0)):
+        """
+        Construit (une seule fois par racine) l'index d'arbre du labyrinthe, qui doit être parfait :
+        distance_geo est ensuite calculée sans parcours. L'index est oublié dès que les murs changent.
+
+        Paramètres: root (tuple): la cellule racine de l'arbre.
+
+        Valeur de retour : TreeIndex : l'index, dont la méthode path(start, stop) donne le chemin entre deux cellules.
+        """
+        cle = ("tree", root)
+        if cle not in self._cache:
+            self._cache[cle] = TreeIndex(self, root)
+        #les distances ne dépendent pas de la racine : distance_geo utilise le dernier index construit
+        self._cache["tree"] = self._cache[cle]
+        return self._cache[cle]
 
     def distance_geo(self, c1, c2):
         """
@@ -659,13 +1840,73 @@ class Maze:
                     c1 (tuple): les coordonnées de la première cellule
                     c2 (tuple): les coordonnées de la deuxième cellule
             
-        Valeur de retour :  str : une chaîne de caractères décrivant la distance géodésique entre `c1` et `c2`.
-                            La distance géodésique est calculée en utilisant l'algorithme de parcours en profondeur
-                            pour trouver le chemin le plus court entre `c1` et `c2`.
+        Valeur de retour :  int : le nombre de déplacements du plus court chemin entre `c1` et `c2`,
+                            lu dans l'index d'arbre s'il a été construit (build_index),
+                            sinon calculé avec le parcours en largeur (solve_bfs).
+        """
+        if "tree" in self._cache:
+            return self._cache["tree"].distance(c1, c2)
+        return len(self.solve_bfs(c1, c2)) - 1
+
+    def distance_field(self, targets):
+        """
+        Champ de distances vers un ensemble de cellules cibles (les sorties), calculé par un seul parcours
+        en largeur (_bfs) depuis toutes les cibles à la fois : chaque agent lit ensuite son prochain déplacement
+        en O(1) au lieu de lancer sa propre résolution. Les _FIELDS derniers champs demandés sont gardés
+        en cache jusqu'à la prochaine modification des murs (add_wall, remove_wall).
+
+        Paramètres: targets : liste des cellules cibles.
+
+        Valeur de retour : (dist, dirs) :
+                    dist (array('i')) : distance de chaque cellule k = i*width+j à la cible la plus proche
+                                        (-1 si aucune cible n'est accessible),
+                    dirs (bytearray) : direction (NORTH, SOUTH, WEST ou EAST) du premier pas vers cette cible
+                                       (0 pour une cible ou une cellule d'où aucune cible n'est accessible).
+        """
+        w = self.width
+        cle = frozenset(targets)
+        champs = self._cache.setdefault("fields", OrderedDict())     # cibles -> champ, du plus ancien au plus récent
+        if cle in champs:
+            champs.move_to_end(cle)
+            return champs[cle]
+        for (i, j) in cle:
+            assert 0 <= i < self.height and 0 <= j < w, f"Erreur lors du calcul du champ : cible {(i, j)} hors du labyrinthe"
+        pred, file, _ = self._bfs([i*w + j for (i, j) in cle])
+        n = self.height * w
+        dist = array("i", [-1]) * n
+        dirs = bytearray(n)
+        #Le premier pas d'une cellule va vers son prédécesseur dans le parcours, déjà traité (ordre de la file)
+        #(si w == 1, ±w écrase ±1 : il n'y a alors que des pas verticaux)
+        vers = {-1: WEST, 1: EAST, -w: NORTH, w: SOUTH}
+        for k in file:
+            p = pred[k]
+            if p == k:
+                dist[k] = 0
+            else:
+                dist[k] = dist[p] + 1
+                dirs[k] = vers[p - k]
+        champs[cle] = (dist, dirs)
+        if len(champs) > _FIELDS:
+            champs.popitem(last=False)
+        return dist, dirs
+
+    def next_step(self, cell, targets):
+        """
+        Prochain déplacement d'un agent situé en cell vers la plus proche des cibles, lu dans le champ
+        de distances (distance_field, calculé une seule fois pour toutes les requêtes sur ces cibles).
+
+        Paramètres: cell (tuple): la position de l'agent.
+                    targets : liste des cellules cibles.
+
+        Valeur de retour : tuple : la cellule voisine où aller, None si cell est une cible ou si aucune cible n'est accessible.
         """
-        distGeo = len(self.solve_dfs(c1, c2))
-        res = f"La distance Géodésique du labyrinthe est : {distGeo}"
-        return res
+        dirs = self.distance_field(targets)[1]
+        d = dirs[cell[0]*self.width + cell[1]]
+        if not d:
+            return None
+        for (di, dj), direction in _DIRECTIONS.items():
+            if direction == d:
+                return (cell[0] + di, cell[1] + dj)
 
     def distance_man(self, c1, c2):
         """
@@ -675,13 +1916,915 @@ class Maze:
                     c1 (tuple): coordonnées (x, y) de la première cellule
                     c2 (tuple): coordonnées (x, y) de la seconde cellule
 
-        Valeur de retour : res (str): la distance de Manhattan du labyrinthe entre les deux cellules données `c1` et `c2`.
+        Valeur de retour : int : la distance de Manhattan entre les deux cellules données `c1` et `c2`.
         """
         #Calcul des distances horizontale et verticale séparant c1 et c2
         distHori = abs(c1[0] - c2[0])
         distVerti = abs(c1[1] - c2[1])
         # Calcul de la distance de Manhattan en additionnant les distances horizontale et verticale
-        distMan = distHori + distVerti 
-        res = f"La distance de Manhattan du labyrinthe est : {distMan}"
-        return res
-    
\ No newline at end of file
+        return distHori + distVerti
+
+    def stats(self, start=None, stop=None):
+        """
+        Statistiques du labyrinthe pour en estimer la difficulté, calculées en bloc sur la représentation
+        compacte (bytes.translate, split) plus deux parcours en largeur.
+
+        Paramètres: start (tuple): l'entrée (par défaut (0, 0)).
+                    stop (tuple): la sortie (par défaut la cellule en bas à droite).
+
+        Valeur de retour : dict :
+                    degres (bytes) : nombre de passages de chaque cellule k = i*width+j
+                                     (carte des impasses : degré 1, des carrefours : degré 3 ou 4),
+                    impasses, couloirs, carrefours (int) : nombre de cellules de degré 1, 2, 3 ou plus,
+                    couloirs_droits (dict) : longueur -> nombre de couloirs droits (horizontaux ou verticaux)
+                                             de cette longueur en cellules,
+                    longueur_solution (int) : nombre de déplacements de start à stop (-1 si inaccessible),
+                    excentricite (int) : distance de start à la cellule accessible la plus éloignée,
+                    diametre (int) : plus longue distance entre deux cellules (exacte pour un labyrinthe parfait),
+                    plus_long_chemin (tuple) : les deux extrémités de ce plus long chemin.
+        """
+        start = (0, 0) if start is None else start
+        stop = (self.height - 1, self.width - 1) if stop is None else stop
+        cle = ("stats", start, stop)
+        if cle in self._cache:
+            res = self._cache[cle]
+            #copie : modifier le résultat ne doit pas altérer le cache
+            return dict(res, couloirs_droits=dict(res["couloirs_droits"]))
+        w = self.width
+        bits = self._bits()
+        degres = bits.translate(_DEGREE)
+        #couloirs droits : suites de cellules qui n'ont que deux passages opposés, par ligne puis par colonne
+        couloirs = Counter(map(len, bits.translate(_STRAIGHT_EW).split(b"\x00")))
+        colonnes = b"".join(bits[j::w] for j in range(w))
+        couloirs.update(map(len, colonnes.translate(_STRAIGHT_NS).split(b"\x00")))
+        del couloirs[0]
+        #premier parcours depuis l'entrée : sortie, excentricité et cellule la plus éloignée
+        depart, arrivee = start[0]*w + start[1], stop[0]*w + stop[1]
+        pred, file, _ = self._bfs([depart])
+        a = file[-1]
+        excentricite = len(self._path(pred, a)) - 1
+        solution = len(self._path(pred, arrivee)) - 1 if pred[arrivee] != -1 else -1
+        #second parcours depuis cette cellule : la plus éloignée de celle-ci donne le diamètre (arbre)
+        pred, file, _ = self._bfs([a])
+        b = file[-1]
+        res = {"degres": degres,
+               "impasses": degres.count(1),
+               "couloirs": degres.count(2),
+               "carrefours": degres.count(3) + degres.count(4),
+               "couloirs_droits": dict(sorted(couloirs.items())),
+               "longueur_solution": solution,
+               "excentricite": excentricite,
+               "diametre": len(self._path(pred, b)) - 1,
+               "plus_long_chemin": (divmod(a, w), divmod(b, w))}
+        self._cache[cle] = res
+        return dict(res, couloirs_droits=dict(res["couloirs_droits"]))
+
+
+class NeighborSet(set):
+    """
+    Ensemble des voisines accessibles d'une cellule, tel que rendu par maze.neighbors[c] : une modification
+    sur place (add, discard...) est signalée au labyrinthe (Maze._changed), comme add_wall / remove_wall,
+    pour que les structures en cache (représentation compacte, rendu, index) ne deviennent pas fausses.
+    """
+    __slots__ = ("_maze", "_cell")
+
+    def __init__(self, maze, cell, voisins=()):
+        set.__init__(self, voisins)
+        self._maze = maze
+        self._cell = cell
+
+    def add(self, c):
+        super().add(c)
+        self._maze._changed(self._cell, c)
+
+    def remove(self, c):
+        super().remove(c)
+        self._maze._changed(self._cell, c)
+
+    def discard(self, c):
+        super().discard(c)
+        self._maze._changed(self._cell, c)
+
+    def _bulk(methode):
+        # modification de plusieurs voisines à la fois : tout le labyrinthe est signalé comme modifié
+        def modifier(self, *args):
+            res = methode(self, *args)
+            self._maze._changed()
+            return res
+        modifier.__name__ = methode.__name__
+        return modifier
+
+    pop = _bulk(set.pop)
+    clear = _bulk(set.clear)
+    update = _bulk(set.update)
+    difference_update = _bulk(set.difference_update)
+    intersection_update = _bulk(set.intersection_update)
+    symmetric_difference_update = _bulk(set.symmetric_difference_update)
+    __ior__ = _bulk(set.__ior__)
+    __iand__ = _bulk(set.__iand__)
+    __isub__ = _bulk(set.__isub__)
+    __ixor__ = _bulk(set.__ixor__)
+    del _bulk
+
+
+class LazyNeighbors(MutableMapping):
+    """
+    Voisinages implicites d'un labyrinthe (attribut neighbors de Maze) : dictionnaire cellule -> ensemble
+    des voisines accessibles, dont seules les cellules modifiées sont stockées (edited). Les autres sont
+    déduites de l'état de base : tout muré (opened=False), tout ouvert, ou une représentation compacte
+    (base, voir Maze._bits) comme celle produite par les générateurs.
+    La construction, fill(), empty() et from_bits ne créent donc aucun ensemble, quelle que soit la taille.
+
+    Lire self[c] stocke l'ensemble de c, un NeighborSet : il peut être modifié sur place, le labyrinthe
+    en est prévenu ; peek(c) le calcule sans le stocker.
+    """
+    def __init__(self, maze, opened=False, edited=None, base=None):
+        """
+        Paramètres: maze : le labyrinthe (pour ses dimensions).
+                    opened : état de base, True si tous les murs intérieurs sont absents.
+                    edited : dictionnaire des cellules modifiées (cellule -> ensemble des voisines).
+                    base : état de base en représentation compacte (bytes, un octet par cellule) ;
+                           s'il est donné, opened est ignoré.
+        """
+        self._maze = maze
+        self.opened = opened
+        self.base = base
+        self.edited = {} if edited is None else edited
+
+    def _check(self, c):
+        if not (0 <= c[0] < self._maze.height and 0 <= c[1] < self._maze.width):
+            raise KeyError(c)
+
+    def peek(self, c):
+        """
+        Retourne les voisines accessibles de c, sans stocker l'ensemble si c n'a jamais été modifiée.
+        """
+        if c in self.edited:
+            return self.edited[c]
+        self._check(c)
+        if self.base is not None:
+            i, j = c
+            b = self.base[i*self._maze.width + j]
+            return {(i+di, j+dj) for (di, dj), d in _DIRECTIONS.items() if b & d}
+        return set(self._maze.get_contiguous_cells(c)) if self.opened else set()
+
+    def base_bits(self):
+        """
+        Représentation compacte (voir Maze._bits) de l'état de base, construite par rangées entières.
+        """
+        h, w = self._maze.height, self._maze.width
+        if self.base is not None:
+            return bytearray(self.base)
+        if not self.opened or h * w == 0:
+            return bytearray(h * w)
+        ligne = bytes([WEST | EAST]) * w
+        ligne = bytes([ligne[0] & ~WEST]) + ligne[1:-1] + bytes([ligne[-1] & ~EAST]) if w > 1 else bytes(1)
+        if h == 1:
+            return bytearray(ligne)
+        haut, milieu, bas = (bytes(b | d for b in ligne) for d in (SOUTH, NORTH | SOUTH, NORTH))
+        return bytearray(haut + milieu * (h - 2) + bas)
+
+    def __getitem__(self, c):
+        voisins = self.edited.get(c)
+        if not isinstance(voisins, NeighborSet):
+            voisins = self.edited[c] = NeighborSet(self._maze, c, self.peek(c))
+        return voisins
+
+    def __setitem__(self, c, voisins):
+        self._check(c)
+        self.edited[c] = NeighborSet(self._maze, c, voisins)
+        self._maze._changed()
+
+    def __delitem__(self, c):
+        # une cellule n'est jamais retirée de la grille : elle revient à l'état de base
+        self._check(c)
+        self.edited.pop(c, None)
+        self._maze._changed()
+
+    def __contains__(self, c):
+        return isinstance(c, tuple) and len(c) == 2 and 0 <= c[0] < self._maze.height and 0 <= c[1] < self._maze.width
+
+    def __iter__(self):
+        for i in range(self._maze.height):
+            for j in range(self._maze.width):
+                yield (i, j)
+
+    def __len__(self):
+        return self._maze.height * self._maze.width
+
+    def __repr__(self):
+        return repr({c: self.peek(c) for c in self})
+
+
+class NeighborsView(Mapping):
+    """
+    Vue en lecture seule des voisinages d'un labyrinthe compact,
+    compatible avec l'ancien attribut neighbors (dictionnaire cellule -> ensemble des voisines accessibles).
+    Les ensembles sont calculés à la demande.
+    """
+    def __init__(self, maze):
+        self._maze = maze
+
+    def __getitem__(self, c):
+        if not (0 <= c[0] < self._maze.height and 0 <= c[1] < self._maze.width):
+            raise KeyError(c)
+        return frozenset(self._maze.get_reachable_cells(c))
+
+    def __iter__(self):
+        for i in range(self._maze.height):
+            for j in range(self._maze.width):
+                yield (i, j)
+
+    def __len__(self):
+        return self._maze.height * self._maze.width
+
+    def __repr__(self):
+        return repr({c: set(v) for c, v in self.items()})
+
+
+class BitMaze(Maze):
+    """
+    Labyrinthe à stockage compact : au lieu d'un dictionnaire d'ensembles,
+    les passages sont rangés dans un bytearray d'un octet par cellule (indice i*width+j)
+    combinant les bits NORTH, SOUTH, WEST et EAST des passages ouverts.
+    L'interface est celle de Maze : toutes les méthodes gen_* et solve_* fonctionnent à l'identique
+    (Maze.gen_fusion(h, w) -> BitMaze.gen_fusion(h, w)).
+    L'attribut neighbors est une vue en lecture seule (NeighborsView).
+    """
+    @property
+    def neighbors(self):
+        return NeighborsView(self)
+
+    def fill(self):
+        """
+        Remet tous les murs du labyrinthe : aucune cellule n'a de passage ouvert.
+        """
+        self._cells = bytearray(self.height * self.width)
+        self._changed()
+        return None
+
+    def empty(self):
+        """
+        Supprime tous les murs intérieurs du labyrinthe.
+        """
+        h, w = self.height, self.width
+        self._changed()
+        if h == 0 or w == 0:
+            self._cells = bytearray()
+            return None
+        ligne = bytearray(w)
+        for j in range(w):
+            ligne[j] = (WEST if j > 0 else 0) | (EAST if j < w-1 else 0)
+        if h == 1:
+            self._cells = ligne
+            return None
+        haut   = bytearray(b | SOUTH for b in ligne)
+        milieu = bytearray(b | SOUTH | NORTH for b in ligne)
+        bas    = bytearray(b | NORTH for b in ligne)
+        self._cells = haut + milieu * (h-2) + bas
+        return None
+
+    def add_wall(self, c1, c2):
+        assert 0 <= c1[0] < self.height and \
+            0 <= c1[1] < self.width and \
+            0 <= c2[0] < self.height and \
+            0 <= c2[1] < self.width, \
+            f"Erreur lors de l'ajout d'un mur entre {c1} et {c2} : les coordonnées de sont pas compatibles avec les dimensions du labyrinthe"
+        d = _DIRECTIONS.get((c2[0]-c1[0], c2[1]-c1[1]))
+        # Deux cellules non contigües ne sont jamais reliées : rien à faire
+        if d is not None:
+            self._cells[c1[0]*self.width + c1[1]] &= ~d
+            self._cells[c2[0]*self.width + c2[1]] &= ~_OPPOSITE[d]
+        if _PROBES:
+            _report("add_wall", {"appels": 1})
+        self._changed(c1, c2)
+        return None
+
+    def remove_wall(self, c1, c2):
+        assert 0 <= c1[0] < self.height and \
+            0 <= c1[1] < self.width and \
+            0 <= c2[0] < self.height and \
+            0 <= c2[1] < self.width, \
+            f"Erreur lors de la suppression d'un mur entre {c1} et {c2} : les coordonnées de sont pas compatibles avec les dimensions du labyrinthe"
+        d = _DIRECTIONS.get((c2[0]-c1[0], c2[1]-c1[1]))
+        assert d is not None, \
+            f"Erreur lors de la suppression d'un mur entre {c1} et {c2} : les cellules ne sont pas contigües"
+        self._cells[c1[0]*self.width + c1[1]] |= d
+        self._cells[c2[0]*self.width + c2[1]] |= _OPPOSITE[d]
+        if _PROBES:
+            _report("remove_wall", {"appels": 1})
+        self._changed(c1, c2)
+        return None
+
+    def get_reachable_cells(self, c):
+        b = self._cells[c[0]*self.width + c[1]]
+        reachable = []
+        if b & NORTH:
+            reachable.append((c[0]-1, c[1]))
+        if b & SOUTH:
+            reachable.append((c[0]+1, c[1]))
+        if b & WEST:
+            reachable.append((c[0], c[1]-1))
+        if b & EAST:
+            reachable.append((c[0], c[1]+1))
+        return reachable
+
+    def _bits(self):
+        # Le stockage est déjà compact : on le renvoie directement (à ne pas modifier)
+        return self._cells
+
+    def _load_bits(self, bits):
+        self._cells = bytearray(bits)
+        self._changed()
+        return None
+
+
+class MappedMaze(BitMaze):
+    """
+    Labyrinthe en lecture seule lu à la demande dans un fichier écrit par Maze.save, projeté en mémoire (mmap) :
+    l'ouverture ne lit que l'en-tête, et get_reachable_cells ne lit que les octets des cellules concernées.
+    Les méthodes qui parcourent tout le labyrinthe (solve_*, __str__...) décodent le fichier une seule fois.
+    Les méthodes qui modifient les murs lèvent io.UnsupportedOperation. Utilisable dans un bloc with,
+    qui ferme le fichier en sortie.
+    """
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        self._data = mmap(self._file.fileno(), 0, access=ACCESS_READ)
+        self.height, self.width, self.generator, self.seed = _read_header(self._data)
+        self.expanded = 0
+        self._cache = {}
+        self._observers = []
+
+    def close(self):
+        """
+        Ferme le fichier sous-jacent.
+        """
+        self._data.close()
+        self._file.close()
+        return None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def _code(self, k):
+        # 2 bits de la cellule k : bit 0 passage EST, bit 1 passage SUD
+        return self._data[_HEADER.size + (k >> 2)] >> ((k & 3) << 1) & 3
+
+    def get_reachable_cells(self, c):
+        w = self.width
+        k = c[0]*w + c[1]
+        code = self._code(k)
+        reachable = []
+        if c[0] > 0 and self._code(k-w) & 2:
+            reachable.append((c[0]-1, c[1]))
+        if code & 2:
+            reachable.append((c[0]+1, c[1]))
+        if c[1] > 0 and self._code(k-1) & 1:
+            reachable.append((c[0], c[1]-1))
+        if code & 1:
+            reachable.append((c[0], c[1]+1))
+        return reachable
+
+    def _bits(self):
+        if "bits" not in self._cache:
+            bits = bytearray(_unpack_cells(self._data[_HEADER.size:], self.height * self.width))
+            _add_reverse_bits(bits, self.width)
+            self._cache["bits"] = bits
+        return self._cache["bits"]
+
+    # Lecture seule : une exception (et non un assert, supprimé par python -O) pour ne jamais ignorer une modification
+    def add_wall(self, c1, c2):
+        raise UnsupportedOperation(f"Erreur lors de l'ajout d'un mur entre {c1} et {c2} : labyrinthe ouvert en lecture seule")
+
+    def remove_wall(self, c1, c2):
+        raise UnsupportedOperation(f"Erreur lors de la suppression d'un mur entre {c1} et {c2} : labyrinthe ouvert en lecture seule")
+
+    def fill(self):
+        raise UnsupportedOperation("Erreur lors du remplissage : labyrinthe ouvert en lecture seule")
+
+    def empty(self):
+        raise UnsupportedOperation("Erreur lors du vidage : labyrinthe ouvert en lecture seule")
+
+    def _load_bits(self, bits):
+        raise UnsupportedOperation("Erreur lors du chargement : labyrinthe ouvert en lecture seule")
+
+
+def _generate_one(tache):
+    """
+    Tâche d'un processus de Maze.generate_many : génère un labyrinthe à partir de (algorithme, h, w, graine).
+
+    Valeur de retour : bytes : la représentation compacte du labyrinthe.
+    """
+    algorithm, h, w, graine = tache
+    return bytes(getattr(BitMaze, "gen_" + algorithm)(h, w, seed=graine)._bits())
+
+
+def _mix(*parts):
+    """
+    Graine déterministe (64 bits) dérivée d'une clé (graine, identifiants...), identique d'une exécution à l'autre.
+    """
+    return int.from_bytes(blake2b(repr(parts).encode(), digest_size=8).digest(), "little")
+
+
+class TiledMaze:
+    """
+    Labyrinthe géant découpé en blocs (chunks) de chunk x chunk cellules, générés à la demande.
+    Chaque bloc est un labyrinthe parfait généré indépendamment à partir de la clé (seed, ligne, colonne) du bloc.
+    Les blocs sont reliés entre eux par un arbre couvrant de la grille des blocs (arbre binaire : chaque bloc
+    s'ouvre vers son voisin EST ou SUD selon un tirage lui aussi dérivé de la clé), avec une seule porte
+    par liaison, placée au hasard le long de la frontière : le monde entier est donc un labyrinthe parfait.
+    Rien n'est stocké en dehors des blocs matérialisés, gardés dans un cache LRU.
+    Les cellules sont désignées par leurs coordonnées globales (i, j).
+    """
+    def __init__(self, height, width, chunk=256, seed=0, algorithm="wilson", cache_size=64):
+        """
+        Paramètres: height, width : dimensions du monde en cellules.
+                    chunk : côté d'un bloc en cellules (les blocs du bord peuvent être plus petits).
+                    seed : graine du monde.
+                    algorithm : algorithme de génération des blocs ("wilson", "exploration", "fusion"...).
+                    cache_size : nombre maximal de blocs gardés en mémoire.
+        """
+        assert hasattr(Maze, "gen_" + algorithm), f"Erreur lors de la création du monde : algorithme {algorithm} inconnu"
+        self.height     = height
+        self.width      = width
+        self.chunk      = chunk
+        self.seed       = seed
+        self.algorithm  = algorithm
+        self.cache_size = cache_size
+        self.rows       = -(-height // chunk)     # nombre de blocs en hauteur
+        self.cols       = -(-width // chunk)      # nombre de blocs en largeur
+        self._chunks    = OrderedDict()
+
+    def chunk_size(self, cy, cx):
+        """
+        Retourne les dimensions (hauteur, largeur) du bloc (cy, cx).
+        """
+        return min(self.chunk, self.height - cy*self.chunk), min(self.chunk, self.width - cx*self.chunk)
+
+    def get_chunk(self, cy, cx):
+        """
+        Retourne le labyrinthe (BitMaze) du bloc (cy, cx), généré à la demande puis gardé dans le cache LRU.
+        """
+        cle = (cy, cx)
+        if cle in self._chunks:
+            self._chunks.move_to_end(cle)
+            return self._chunks[cle]
+        h, w = self.chunk_size(cy, cx)
+        bloc = getattr(BitMaze, "gen_" + self.algorithm)(h, w, seed=_mix(self.seed, "chunk", cy, cx))
+        self._chunks[cle] = bloc
+        if len(self._chunks) > self.cache_size:
+            self._chunks.popitem(last=False)
+        return bloc
+
+    def _coarse_link(self, cy, cx):
+        """
+        Direction (EAST ou SOUTH) de la liaison du bloc (cy, cx) vers son parent dans l'arbre des blocs,
+        0 pour le bloc racine (en bas à droite). Arbre binaire : la dernière ligne de blocs s'ouvre vers l'EST,
+        la dernière colonne vers le SUD, les autres blocs au hasard.
+        """
+        if cy == self.rows-1:
+            return EAST if cx < self.cols-1 else 0
+        if cx == self.cols-1:
+            return SOUTH
+        return EAST if _mix(self.seed, "coarse", cy, cx) & 1 else SOUTH
+
+    def _door(self, cy, cx, d):
+        """
+        Position de la porte de la liaison d du bloc (cy, cx) : ligne (liaison EST) ou colonne (liaison SUD)
+        dans le bloc, commune aux deux blocs reliés.
+        """
+        h, w = self.chunk_size(cy, cx)
+        return _mix(self.seed, "door", cy, cx, d) % (h if d == EAST else w)
+
+    def _door_open(self, cy, cx, d, pos):
+        # Vrai si la frontière EST ou SUD du bloc (cy, cx) a une porte en position pos
+        return self._coarse_link(cy, cx) == d and self._door(cy, cx, d) == pos
+
+    def get_reachable_cells(self, c):
+        """
+        Retourne la liste des cellules accessibles depuis la cellule c (coordonnées globales),
+        y compris à travers les portes entre blocs.
+        """
+        C = self.chunk
+        cy, y = divmod(c[0], C)
+        cx, x = divmod(c[1], C)
+        h, w = self.chunk_size(cy, cx)
+        reachable = [(cy*C + i, cx*C + j) for (i, j) in self.get_chunk(cy, cx).get_reachable_cells((y, x))]
+        if y == 0 and cy > 0 and self._door_open(cy-1, cx, SOUTH, x):
+            reachable.append((c[0]-1, c[1]))
+        if y == h-1 and cy < self.rows-1 and self._door_open(cy, cx, SOUTH, x):
+            reachable.append((c[0]+1, c[1]))
+        if x == 0 and cx > 0 and self._door_open(cy, cx-1, EAST, y):
+            reachable.append((c[0], c[1]-1))
+        if x == w-1 and cx < self.cols-1 and self._door_open(cy, cx, EAST, y):
+            reachable.append((c[0], c[1]+1))
+        return reachable
+
+    def _coarse_path(self, a, b):
+        """
+        Chemin entre les blocs a et b dans l'arbre des blocs. Chaque liaison mène vers l'EST ou le SUD :
+        la profondeur du bloc (cy, cx) est donc (rows-1-cy) + (cols-1-cx). On remonte le plus profond des deux
+        jusqu'à la même profondeur, puis les deux ensemble jusqu'à leur premier ancêtre commun :
+        le coût ne dépend que de la longueur du chemin, pas de la taille du monde.
+        """
+        parent = lambda c, d: (c[0], c[1]+1) if d == EAST else (c[0]+1, c[1])
+        profondeur = lambda c: (self.rows-1 - c[0]) + (self.cols-1 - c[1])
+        montee, descente = [a], [b]
+        while profondeur(a) > profondeur(b):
+            a = parent(a, self._coarse_link(*a))
+            montee.append(a)
+        while profondeur(b) > profondeur(a):
+            b = parent(b, self._coarse_link(*b))
+            descente.append(b)
+        while a != b:
+            a = parent(a, self._coarse_link(*a))
+            b = parent(b, self._coarse_link(*b))
+            montee.append(a)
+            descente.append(b)
+        descente.pop()
+        descente.reverse()
+        return montee + descente
+
+    def solve(self, start, stop):
+        """
+        Retourne le chemin entre start et stop (coordonnées globales), dans le même ordre que les méthodes
+        solve_* de Maze (de l'arrivée jusqu'au départ). Seuls les blocs traversés sont matérialisés :
+        chemin dans l'arbre des blocs, puis résolution dans chaque bloc entre ses portes d'entrée et de sortie.
+        """
+        C = self.chunk
+        blocs = self._coarse_path((start[0] // C, start[1] // C), (stop[0] // C, stop[1] // C))
+        pathCell = []
+        entree = start
+        for n, (cy, cx) in enumerate(blocs):
+            #Sortie du bloc : la porte vers le bloc suivant, ou l'arrivée
+            if n == len(blocs)-1:
+                sortie, suivante = stop, None
+            else:
+                ny, nx = blocs[n+1]
+                if (ny, nx) == (cy, cx+1):
+                    r = self._door(cy, cx, EAST)
+                    sortie, suivante = (cy*C + r, nx*C - 1), (cy*C + r, nx*C)
+                elif (ny, nx) == (cy+1, cx):
+                    r = self._door(cy, cx, SOUTH)
+                    sortie, suivante = (ny*C - 1, cx*C + r), (ny*C, cx*C + r)
+                elif (ny, nx) == (cy, cx-1):
+                    r = self._door(ny, nx, EAST)
+                    sortie, suivante = (cy*C + r, cx*C), (cy*C + r, cx*C - 1)
+                else:
+                    r = self._door(ny, nx, SOUTH)
+                    sortie, suivante = (cy*C, cx*C + r), (cy*C - 1, cx*C + r)
+            local = self.get_chunk(cy, cx).solve_bfs((entree[0] - cy*C, entree[1] - cx*C),
+                                                     (sortie[0] - cy*C, sortie[1] - cx*C))
+            #solve_bfs renvoie le chemin de la sortie vers l'entrée : on le remet dans le sens du parcours
+            pathCell.extend((cy*C + i, cx*C + j) for (i, j) in reversed(local))
+            entree = suivante
+        pathCell.reverse()
+        return pathCell
+
+    def distance_geo(self, c1, c2):
+        """
+        Retourne la distance géodésique (nombre de déplacements) entre c1 et c2.
+        """
+        return len(self.solve(c1, c2)) - 1
+
+
+# Octet d'une cellule -> le même octet sans le passage d (pour isoler un bloc du reste du labyrinthe)
+_CLEAR = {d: bytes(b & ~d for b in range(256)) for d in (NORTH, SOUTH, WEST, EAST)}
+
+
+def _cluster_table(tache):
+    """
+    Tâche de construction d'un bloc de HPAIndex : distances, à l'intérieur du bloc, entre ses cellules d'entrée.
+
+    Paramètres: tache : (bits, h, w, entrees) : représentation compacte du bloc isolé (h x w cellules)
+                et indices locaux de ses cellules d'entrée.
+
+    Valeur de retour : dict : entrée -> liste des (autre entrée, distance) accessibles dans le bloc.
+    """
+    bits, h, w, entrees = tache
+    bloc = BitMaze.from_bits(h, w, bits)
+    table = {}
+    for e in entrees:
+        pred, file, _ = bloc._bfs([e])
+        dist = {e: 0}
+        for k in file[1:]:
+            dist[k] = dist[pred[k]] + 1
+        table[e] = [(f, dist[f]) for f in entrees if f != e and f in dist]
+    return table
+
+
+class HPAIndex:
+    """
+    Index hiérarchique (HPA*) d'un labyrinthe pour répondre rapidement à de nombreuses requêtes de chemin.
+    La grille est découpée en blocs de cluster x cluster cellules. Les cellules d'entrée d'un bloc sont celles
+    qui ont un passage vers un autre bloc ; les distances entre les entrées d'un même bloc sont précalculées.
+    Une requête cherche un chemin dans ce petit graphe abstrait (Dijkstra), puis le détaille bloc par bloc.
+    L'index est abonné au labyrinthe (Maze.attach) : après add_wall / remove_wall, seuls les blocs
+    des deux cellules concernées sont recalculés.
+    """
+    def __init__(self, maze, cluster=32, workers=None):
+        """
+        Paramètres: maze : le labyrinthe à indexer.
+                    cluster : côté d'un bloc en cellules.
+                    workers : nombre de processus pour la construction des blocs (None ou 1 : processus courant).
+        """
+        self.maze    = maze
+        self.cluster = cluster
+        self.workers = workers
+        self.rows    = -(-maze.height // cluster)
+        self.cols    = -(-maze.width // cluster)
+        self.nodes   = {}      # bloc -> indices globaux de ses entrées
+        self.edges   = {}      # entrée -> liste des (entrée voisine, distance) : même bloc, ou passage vers un autre bloc
+        self.bits    = None    # copie de la représentation compacte du labyrinthe, tenue à jour cellule par cellule
+        self.rebuild()
+        maze.attach(self)
+
+    def _cluster_of(self, k):
+        i, j = divmod(k, self.maze.width)
+        return (i // self.cluster) * self.cols + j // self.cluster
+
+    def _bounds(self, cid):
+        """
+        Retourne (haut, gauche, hauteur, largeur) du bloc cid.
+        """
+        K = self.cluster
+        haut, gauche = (cid // self.cols) * K, (cid % self.cols) * K
+        return haut, gauche, min(K, self.maze.height - haut), min(K, self.maze.width - gauche)
+
+    def _local_bits(self, bits, cid):
+        """
+        Représentation compacte du bloc cid isolé : les passages qui sortent du bloc sont supprimés.
+
+        Valeur de retour : (brut, isole) : les octets du bloc avant et après suppression.
+        """
+        haut, gauche, h, w = self._bounds(cid)
+        W = self.maze.width
+        brut = bytearray()
+        for i in range(haut, haut + h):
+            brut += bits[i*W + gauche:i*W + gauche + w]
+        isole = bytearray(brut)
+        isole[:w] = isole[:w].translate(_CLEAR[NORTH])
+        isole[-w:] = isole[-w:].translate(_CLEAR[SOUTH])
+        isole[::w] = isole[::w].translate(_CLEAR[WEST])
+        isole[w-1::w] = isole[w-1::w].translate(_CLEAR[EAST])
+        return brut, isole
+
+    def _build(self, cids):
+        """
+        (Re)calcule les entrées et les distances internes des blocs cids à partir de self.bits,
+        en parallèle si workers > 1.
+        """
+        bits = self.bits
+        W = self.maze.width
+        pas = {NORTH: -W, SOUTH: W, WEST: -1, EAST: 1}
+        taches, origines = [], []
+        for cid in cids:
+            haut, gauche, h, w = self._bounds(cid)
+            brut, isole = self._local_bits(bits, cid)
+            #une entrée est une cellule du bord dont un passage a été supprimé : ce passage mène à un autre bloc
+            entrees = [k for k in range(h*w) if brut[k] != isole[k]]
+            for k in self.nodes.get(cid, ()):
+                self.edges.pop(k, None)
+            self.nodes[cid] = []
+            for k in entrees:
+                g = (haut + k // w) * W + gauche + k % w
+                self.nodes[cid].append(g)
+                self.edges[g] = [(g + pas[d], 1) for d in (NORTH, SOUTH, WEST, EAST) if (brut[k] ^ isole[k]) & d]
+            taches.append((bytes(isole), h, w, entrees))
+            origines.append((haut, gauche, w))
+        if self.workers and self.workers > 1 and len(taches) > 1:
+            with ProcessPoolExecutor(self.workers) as executor:
+                tables = list(executor.map(_cluster_table, taches, chunksize=max(1, len(taches) // (4 * self.workers))))
+        else:
+            tables = map(_cluster_table, taches)
+        for (haut, gauche, w), table in zip(origines, tables):
+            globale = lambda k: (haut + k // w) * W + gauche + k % w
+            for e, voisines in table.items():
+                self.edges[globale(e)] += [(globale(f), d) for f, d in voisines]
+        return None
+
+    def rebuild(self):
+        """
+        Recalcule tout l'index.
+        """
+        self.bits = bytearray(self.maze._bits())
+        self.nodes.clear()
+        self.edges.clear()
+        self._build(range(self.rows * self.cols))
+        return None
+
+    def wall_changed(self, c1, c2):
+        """
+        Appelée par le labyrinthe après une modification de ses murs (voir Maze.attach) :
+        recalcule les blocs de c1 et de c2 (tout l'index si c1 vaut None). Seuls les octets de c1 et de c2
+        sont relus dans le labyrinthe : le coût ne dépend que de la taille des blocs.
+        """
+        if c1 is None:
+            self.rebuild()
+        else:
+            W = self.maze.width
+            for (i, j) in (c1, c2):
+                b = 0
+                for (x, y) in self.maze.get_reachable_cells((i, j)):
+                    b |= _DIRECTIONS.get((x-i, y-j), 0)
+                self.bits[i*W + j] = b
+            self._build({self._cluster_of(c1[0]*W + c1[1]), self._cluster_of(c2[0]*W + c2[1])})
+        return None
+
+    def _local_maze(self, bits, cid):
+        return BitMaze.from_bits(self._bounds(cid)[2], self._bounds(cid)[3], self._local_bits(bits, cid)[1])
+
+    def solve(self, start, stop):
+        """
+        Retourne le plus court chemin entre start et stop, dans le même ordre que les méthodes solve_* de Maze
+        (de l'arrivée jusqu'au départ).
+        """
+        maze = self.maze
+        W = maze.width
+        bits = self.bits
+        depart, arrivee = start[0]*W + start[1], stop[0]*W + stop[1]
+        cd, ca = self._cluster_of(depart), self._cluster_of(arrivee)
+        blocs = {}
+
+        def local(cid):
+            if cid not in blocs:
+                blocs[cid] = self._local_maze(bits, cid)
+            return blocs[cid]
+
+        def distances(k, cid):
+            #distances, dans le bloc cid, de la cellule k à chacune des entrées du bloc
+            haut, gauche, h, w = self._bounds(cid)
+            pred, file, _ = local(cid)._bfs([(k // W - haut) * w + k % W - gauche])
+            dist = {}
+            for v in file:
+                dist[v] = dist[pred[v]] + 1 if v != pred[v] else 0
+            res = {}
+            for e in self.nodes[cid]:
+                le = (e // W - haut) * w + e % W - gauche
+                if le in dist:
+                    res[e] = dist[le]
+            return res
+
+        vers_arrivee = distances(arrivee, ca)
+        #Dijkstra sur le graphe abstrait : entrées des blocs, plus le départ et l'arrivée
+        meilleur, par = -1, None
+        if cd == ca:
+            haut, gauche, h, w = self._bounds(cd)
+            pred, file, cible = local(cd)._bfs([(depart // W - haut) * w + depart % W - gauche],
+                                               [(arrivee // W - haut) * w + arrivee % W - gauche])
+            if cible != -1:
+                meilleur = len(local(cd)._path(pred, cible)) - 1
+        dist, pred = {}, {}
+        tas = []
+        for e, d in distances(depart, cd).items():
+            dist[e], pred[e] = d, depart
+            heappush(tas, (d, e))
+        while tas:
+            d, u = heappop(tas)
+            if d > dist[u]:
+                continue
+            if meilleur != -1 and d >= meilleur:
+                break
+            if u in vers_arrivee and (meilleur == -1 or d + vers_arrivee[u] < meilleur):
+                meilleur, par = d + vers_arrivee[u], u
+            for v, c in self.edges[u]:
+                if v not in dist or d + c < dist[v]:
+                    dist[v], pred[v] = d + c, u
+                    heappush(tas, (d + c, v))
+        assert meilleur != -1, f"Erreur lors de la résolution : {stop} n'est pas accessible depuis {start}"
+        #Étapes du chemin abstrait, du départ jusqu'à l'arrivée
+        etapes = [arrivee]
+        u = par
+        while u is not None and u != depart:
+            etapes.append(u)
+            u = pred[u]
+        etapes.append(depart)
+        etapes.reverse()
+        #Détail : chemin dans le bloc entre deux étapes du même bloc, simple pas entre deux blocs voisins
+        pathCell = [start]
+        for a, b in zip(etapes, etapes[1:]):
+            cid = self._cluster_of(a)
+            if cid != self._cluster_of(b):
+                pathCell.append(divmod(b, W))
+                continue
+            haut, gauche, h, w = self._bounds(cid)
+            morceau = local(cid).solve_bfs(((a // W) - haut, a % W - gauche), ((b // W) - haut, b % W - gauche))
+            pathCell.extend((haut + i, gauche + j) for (i, j) in reversed(morceau[:-1]))
+        pathCell.reverse()
+        return pathCell
+
+
+class Connectivity:
+    """
+    Suivi incrémental de la connexité d'un labyrinthe modifié par add_wall / remove_wall
+    (éditeur de niveaux) : composantes, nombre de cycles, accessibilité entre deux cellules.
+
+    Les passages sont numérotés comme dans gen_fusion (2k : passage EST de la cellule k, 2k+1 : passage SUD).
+    Une forêt couvrante est maintenue par union-find :
+    - ouvrir un passage est une union, en temps quasi constant ;
+    - fermer un passage hors de la forêt ne change pas la connexité (un cycle de moins), en O(1) ;
+    - fermer un passage de la forêt peut couper une composante : l'union-find est alors reconstruit,
+      une seule fois et seulement à la requête suivante.
+    Le nombre de cycles indépendants est passages - cellules + composantes.
+    Seuls les passages entre cellules contiguës sont suivis.
+    """
+    def __init__(self, maze):
+        """
+        Paramètres: maze : le labyrinthe à suivre ; l'objet s'y abonne (Maze.attach).
+        """
+        self.maze = maze
+        self._rebuild()
+        maze.attach(self)
+
+    def _rebuild(self):
+        """
+        Recalcule l'union-find, la forêt couvrante et le nombre de passages à partir des murs du labyrinthe.
+        """
+        maze = self.maze
+        w, n = maze.width, maze.height * maze.width
+        self.bits  = bytearray(maze._bits())
+        self.tree  = bytearray(2 * n)          # passage -> 1 s'il est dans la forêt couvrante
+        self.links = 0                         # nombre de passages ouverts
+        self.uf    = UnionFind(n)
+        union, tree, bits = self.uf.union, self.tree, self.bits
+        for k in range(n):
+            b = bits[k]
+            if b & EAST:
+                self.links += 1
+                if union(k, k + 1):
+                    tree[2*k] = 1
+            if b & SOUTH:
+                self.links += 1
+                if union(k, k + w):
+                    tree[2*k + 1] = 1
+        self.dirty = False
+        return None
+
+    def wall_changed(self, c1, c2):
+        """
+        Appelée par le labyrinthe après chaque modification (voir Maze.attach).
+        """
+        if c1 is None:
+            self._rebuild()
+            return None
+        d = _DIRECTIONS.get((c2[0] - c1[0], c2[1] - c1[1]))
+        if d is None:
+            return None
+        if d in (NORTH, WEST):
+            c1, c2, d = c2, c1, _OPPOSITE[d]
+        w = self.maze.width
+        k, v = c1[0]*w + c1[1], c2[0]*w + c2[1]
+        arete = 2*k + (d == SOUTH)
+        ouvert = c2 in self.maze.neighbors[c1]
+        if ouvert == bool(self.bits[k] & d):
+            return None                    # pas de changement (mur déjà présent ou déjà absent)
+        if ouvert:
+            self.bits[k] |= d
+            self.bits[v] |= _OPPOSITE[d]
+            self.links += 1
+            if not self.dirty and self.uf.union(k, v):
+                self.tree[arete] = 1
+        else:
+            self.bits[k] &= ~d
+            self.bits[v] &= ~_OPPOSITE[d]
+            self.links -= 1
+            if self.tree[arete]:
+                self.dirty = True
+        return None
+
+    def _uf(self):
+        if self.dirty:
+            self._rebuild()
+        return self.uf
+
+    def is_connected(self, c1, c2):
+        """
+        Retourne True si c2 est accessible depuis c1.
+        """
+        w = self.maze.width
+        return self._uf().connected(c1[0]*w + c1[1], c2[0]*w + c2[1])
+
+    def components(self):
+        """
+        Retourne le nombre de composantes connexes du labyrinthe.
+        """
+        return self._uf().count
+
+    def cycles(self):
+        """
+        Retourne le nombre de cycles indépendants du labyrinthe (0 pour une forêt).
+        """
+        return self.links - self.maze.height * self.maze.width + self.components()
+
+    def is_perfect(self):
+        """
+        Retourne True si le labyrinthe est parfait : connexe et sans cycle,
+        c'est-à-dire exactement cellules - 1 passages et une seule composante.
+        """
+        if self.links != self.maze.height * self.maze.width - 1:
+            return False
+        return self.components() == 1
@@ -0,0 +1,372 @@
+"""
+Mesures de performances des labyrinthes (temps et mémoire).
+
+Utilisation : python benchMaze.py storage [côté ...]
+              python benchMaze.py gen_exploration|gen_wilson|... [côté ...]
+              python benchMaze.py batch [processus ...]
+              python benchMaze.py steps [côté ...]
+              python benchMaze.py service [clients ...]
+              python benchMaze.py suite [côté ...] [--json résultats.json] [--baseline référence.json] [--tolerance 1.5]
+                                                [--no-baseline]
+
+La suite complète est comparée par défaut à la référence enregistrée (REFERENCE, tailles 100 et 500) :
+elle se termine en erreur (code 1) si une opération est plus lente que la référence au-delà de la tolérance,
+et sert ainsi de test de non-régression. La référence a été mesurée sur la machine de développement
+(pire de trois exécutions) : sur une autre machine, en enregistrer une nouvelle avec
+python benchMaze.py suite 100 500 --no-memory --no-baseline --json benchReference.json
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import sys
+import time
+import tracemalloc
+from collections import Counter
+from random import randrange
+
+from SAEMaze import Maze, BitMaze
+
+# Résultats de référence de la suite, comparés par défaut (voir regressions)
+REFERENCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchReference.json")
+
+
+def mesure(fonction):
+    """
+    Exécute fonction() en mesurant son temps d'exécution et son pic de mémoire.
+
+    Valeur de retour : (résultat, secondes, octets) : le résultat de l'appel, sa durée et le pic mémoire alloué.
+    """
+    tracemalloc.start()
+    debut = time.perf_counter()
+    res = fonction()
+    duree = time.perf_counter() - debut
+    pic = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return res, duree, pic
+
+
+def maze_ensembles(h, w):
+    """
+    Labyrinthe plein dont chaque cellule a déjà son ensemble de voisines : la disposition d'origine
+    de Maze (dictionnaire d'ensembles), que les voisinages implicites ne construisent qu'à la demande.
+    Sert de référence à compare_storage.
+    """
+    laby = Maze(h, w, empty=False)
+    for i in range(h):
+        for j in range(w):
+            laby.neighbors[(i, j)]
+    return laby
+
+
+# Stockages comparés par compare_storage : nom -> constructeur d'un labyrinthe plein de n x n cellules
+STOCKAGES = {"ensembles": lambda n: maze_ensembles(n, n),       # dictionnaire d'ensembles, tout matérialisé
+             "implicite": lambda n: Maze(n, n, empty=False),    # Maze : seules les cellules modifiées sont stockées
+             "compact": lambda n: BitMaze(n, n, empty=False)}   # BitMaze : un octet par cellule
+# Côté maximal mesuré pour la référence "ensembles" (environ 340 Mo à 1000 x 1000, plusieurs Go au-delà)
+MAX_ENSEMBLES = 1000
+
+
+def compare_storage(tailles, nb_ops=100000):
+    """
+    Compare les stockages de STOCKAGES (dictionnaire d'ensembles de référence, Maze implicite, BitMaze compact) :
+    mémoire et temps de construction d'un labyrinthe plein de n x n cellules,
+    puis débit de nb_ops appels remove_wall + get_reachable_cells sur des cellules tirées au hasard.
+    La référence "ensembles" n'est mesurée que jusqu'à MAX_ENSEMBLES de côté.
+
+    Paramètres: tailles : liste des côtés n à mesurer.
+                nb_ops : nombre d'opérations pour la mesure de débit.
+
+    Valeur de retour : liste de dictionnaires, un par (stockage, taille).
+    """
+    resultats = []
+    for n in tailles:
+        cellules = [(randrange(n), randrange(n - 1)) for _ in range(nb_ops)]
+        for nom, construire in STOCKAGES.items():
+            if nom == "ensembles" and n > MAX_ENSEMBLES:
+                continue
+            laby, duree, pic = mesure(lambda: construire(n))
+            debut = time.perf_counter()
+            for (i, j) in cellules:
+                laby.remove_wall((i, j), (i, j + 1))
+                laby.get_reachable_cells((i, j))
+            debit = nb_ops / (time.perf_counter() - debut)
+            resultats.append({"stockage": nom, "taille": n, "construction_s": duree,
+                              "memoire_octets": pic, "ops_par_s": debit})
+            del laby
+    return resultats
+
+
+def bench_generation(generateur, tailles):
+    """
+    Mesure le débit (cellules générées par seconde) d'un générateur sur des labyrinthes de n x n cellules.
+
+    Paramètres: generateur : méthode de classe gen_* (par exemple BitMaze.gen_exploration).
+                tailles : liste des côtés n à mesurer.
+
+    Valeur de retour : liste de dictionnaires, un par taille.
+    """
+    resultats = []
+    for n in tailles:
+        debut = time.perf_counter()
+        generateur(n, n)
+        duree = time.perf_counter() - debut
+        resultats.append({"generateur": generateur.__name__, "taille": n, "secondes": duree,
+                          "cellules_par_s": n * n / duree})
+    return resultats
+
+
+def bench_batch(workers, algorithm="wilson", n=100, count=200):
+    """
+    Mesure le débit de Maze.generate_many (labyrinthes par seconde) selon le nombre de processus.
+
+    Valeur de retour : liste de dictionnaires, un par nombre de processus.
+    """
+    resultats = []
+    for nb in workers:
+        debut = time.perf_counter()
+        Maze.generate_many(algorithm, n, n, count, seed=0, workers=nb)
+        duree = time.perf_counter() - debut
+        resultats.append({"processus": nb, "secondes": duree, "labyrinthes_par_s": count / duree})
+    return resultats
+
+
+def _resolu(n):
+    laby = BitMaze.gen_exploration(n, n, seed=n)
+    return laby, (0, 0), (n - 1, n - 1)
+
+
+def _rendu(n):
+    laby = BitMaze.gen_exploration(n, n, seed=n)
+    return laby, {cell: "*" for cell in laby.solve_bfs((0, 0), (n - 1, n - 1))}
+
+
+def _sans_cache(laby):
+    # le rendu sans contenu est mis en cache : on mesure le premier rendu
+    laby._cache.clear()
+    return laby
+
+
+# Opérations de la suite : nom -> (préparation(n) non chronométrée, opération(état) chronométrée)
+OPERATIONS = {
+    "gen_btree":       (lambda n: n, lambda n: BitMaze.gen_btree(n, n, seed=0)),
+    "gen_sidewinder":  (lambda n: n, lambda n: BitMaze.gen_sidewinder(n, n, seed=0)),
+    "gen_fusion":      (lambda n: n, lambda n: BitMaze.gen_fusion(n, n, seed=0)),
+    "gen_exploration": (lambda n: n, lambda n: BitMaze.gen_exploration(n, n, seed=0)),
+    "gen_wilson":      (lambda n: n, lambda n: BitMaze.gen_wilson(n, n, seed=0)),
+    "solve_dfs":       (_resolu, lambda etat: etat[0].solve_dfs(etat[1], etat[2])),
+    "solve_bfs":       (_resolu, lambda etat: etat[0].solve_bfs(etat[1], etat[2])),
+    "solve_rhr":       (_resolu, lambda etat: etat[0].solve_rhr(etat[1], etat[2])),
+    "solve_tremaux":   (_resolu, lambda etat: etat[0].solve_tremaux(etat[1], etat[2])),
+    "solve_dead_end_filling": (_resolu, lambda etat: etat[0].solve_dead_end_filling(etat[1], etat[2])),
+    "__str__":         (_rendu, lambda etat: str(_sans_cache(etat[0]))),
+    "overlay":         (_rendu, lambda etat: _sans_cache(etat[0]).overlay(etat[1])),
+}
+
+
+def bench_suite(tailles, operations=None, memoire=True):
+    """
+    Chronomètre chaque opération (générateurs, résolutions, rendus) sur des labyrinthes de n x n cellules.
+    Le pic mémoire est mesuré par tracemalloc lors d'une seconde exécution, pour ne pas fausser le temps.
+
+    Paramètres: tailles : liste des côtés n à mesurer.
+                operations : noms des opérations (par défaut toutes celles de OPERATIONS).
+                memoire : False pour ne pas mesurer le pic mémoire.
+
+    Valeur de retour : liste de dictionnaires, un par (opération, taille).
+    """
+    resultats = []
+    for nom in operations or OPERATIONS:
+        preparation, operation = OPERATIONS[nom]
+        for n in tailles:
+            etat = preparation(n)
+            debut = time.perf_counter()
+            operation(etat)
+            duree = time.perf_counter() - debut
+            pic = mesure(lambda: operation(etat))[2] if memoire else None
+            resultats.append({"operation": nom, "taille": n, "secondes": duree,
+                              "cellules_par_s": n * n / duree if duree else math.inf, "memoire_octets": pic})
+    return resultats
+
+
+def bench_steps(tailles, nb=5):
+    """
+    Compare le nombre de pas des résolutions « robot » à celui du parcours en profondeur, de (0, 0) à (n-1, n-1)
+    sur nb labyrinthes parfaits de n x n cellules : cellules dépilées par solve_dfs, pas de la marche main droite,
+    pas de Trémaux, cellules comblées par solve_dead_end_filling.
+
+    Valeur de retour : liste de dictionnaires, un par taille (moyennes sur les nb labyrinthes).
+    """
+    resultats = []
+    for n in tailles:
+        totaux = Counter()
+        for graine in range(nb):
+            laby, depart, arrivee = BitMaze.gen_wilson(n, n, seed=graine), (0, 0), (n - 1, n - 1)
+            with BitMaze.instrument() as sonde:
+                laby.solve_dfs(depart, arrivee)
+            totaux["solve_dfs"] += sonde.counts["solve_dfs.depilements"]
+            for nom in ("solve_rhr", "solve_tremaux", "solve_dead_end_filling"):
+                getattr(laby, nom)(depart, arrivee)
+                totaux[nom] += laby.expanded
+            totaux["chemin"] += len(laby.solve_bfs(depart, arrivee)) - 1
+        resultats.append({"taille": n, **{nom: total / nb for nom, total in totaux.items()}})
+    return resultats
+
+
+def percentile(valeurs, p):
+    """
+    Retourne le p-ième centile (0 à 100) de valeurs (méthode du rang le plus proche).
+    """
+    triees = sorted(valeurs)
+    return triees[min(len(triees) - 1, max(0, math.ceil(p / 100 * len(triees)) - 1))]
+
+
+def bench_service(clients, requetes=50, n=50, graines=20, algorithm="wilson"):
+    """
+    Test de charge du service (serviceMaze) : un serveur local sur un port libre, et pour chaque niveau
+    de concurrence, autant de clients HTTP qui envoient chacun requetes requêtes en parallèle.
+    Les graines sont tirées parmi graines valeurs pour exercer le cache et le regroupement des requêtes.
+
+    Valeur de retour : liste de dictionnaires, un par niveau de concurrence : latences p50 / p99 (secondes),
+    requêtes par seconde, et compteurs du service (hits, misses, coalesced).
+    """
+    from serviceMaze import MazeService, fetch
+
+    async def charge(service, port, nb):
+        latences = []
+
+        async def client(numero):
+            for r in range(requetes):
+                debut = time.perf_counter()
+                statut, _ = await fetch("127.0.0.1", port, algorithm, n, n, seed=(numero * 7919 + r * 104729) % graines)
+                assert statut == 200, f"Erreur lors du test de charge : statut {statut}"
+                latences.append(time.perf_counter() - debut)
+
+        debut = time.perf_counter()
+        await asyncio.gather(*(client(c) for c in range(nb)))
+        return latences, time.perf_counter() - debut
+
+    async def principal():
+        resultats = []
+        for nb in clients:
+            service = MazeService(cache_size=graines // 2)
+            serveur = await service.serve(port=0)
+            port = serveur.sockets[0].getsockname()[1]
+            try:
+                latences, duree = await charge(service, port, nb)
+            finally:
+                serveur.close()
+                await serveur.wait_closed()
+                service.close()
+            resultats.append({"clients": nb, "p50_s": percentile(latences, 50), "p99_s": percentile(latences, 99),
+                              "requetes_par_s": len(latences) / duree, "hits": service.hits,
+                              "misses": service.misses, "coalesced": service.coalesced})
+        return resultats
+
+    return asyncio.run(principal())
+
+
+def scaling(resultats):
+    """
+    Exposant de croissance de chaque opération : pente (moindres carrés) de log(temps) en fonction
+    de log(nombre de cellules). 1 : linéaire, 2 : quadratique.
+
+    Valeur de retour : dict : opération -> exposant (None s'il y a moins de deux tailles mesurables).
+    """
+    points = {}
+    for r in resultats:
+        if r["secondes"] > 0:
+            points.setdefault(r["operation"], []).append((math.log(r["taille"] ** 2), math.log(r["secondes"])))
+    exposants = {}
+    for nom, pts in points.items():
+        if len(pts) < 2:
+            exposants[nom] = None
+            continue
+        mx = sum(x for x, _ in pts) / len(pts)
+        my = sum(y for _, y in pts) / len(pts)
+        variance = sum((x - mx) ** 2 for x, _ in pts)
+        exposants[nom] = sum((x - mx) * (y - my) for x, y in pts) / variance if variance else None
+    return exposants
+
+
+def regressions(resultats, reference, tolerance=1.5, minimum=0.01):
+    """
+    Compare des résultats à une référence (même format) : une opération régresse si, pour une même taille,
+    elle est plus de tolerance fois plus lente. Les durées de référence inférieures à minimum secondes
+    sont ignorées (trop bruitées).
+
+    Valeur de retour : liste de chaînes décrivant les régressions (vide si aucune).
+    """
+    avant = {(r["operation"], r["taille"]): r["secondes"] for r in reference}
+    trouvees = []
+    for r in resultats:
+        ref = avant.get((r["operation"], r["taille"]))
+        if ref is not None and ref >= minimum and r["secondes"] > tolerance * ref:
+            trouvees.append(f"{r['operation']} {r['taille']}x{r['taille']} : {r['secondes']:.3f} s "
+                            f"au lieu de {ref:.3f} s (x{r['secondes'] / ref:.2f})")
+    return trouvees
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mesures de performances des labyrinthes.")
+    parser.add_argument("bench", nargs="?", default="storage")
+    parser.add_argument("valeurs", nargs="*", type=int)
+    parser.add_argument("--json", help="fichier où enregistrer les résultats de la suite")
+    parser.add_argument("--baseline", default=REFERENCE,
+                        help="résultats de référence (JSON) : une régression fait échouer la suite (par défaut REFERENCE)")
+    parser.add_argument("--no-baseline", action="store_true", help="ne pas comparer à une référence")
+    parser.add_argument("--tolerance", type=float, default=1.5)
+    parser.add_argument("--no-memory", action="store_true", help="ne pas mesurer le pic mémoire")
+    args = parser.parse_args()
+    bench, tailles = args.bench, args.valeurs
+    if bench == "suite":
+        resultats = bench_suite(tailles or [10, 100, 500, 1000, 2000], memoire=not args.no_memory)
+        print(f"{'opération':<24}{'taille':>8}{'secondes':>12}{'cellules/s':>14}{'mémoire (Mo)':>14}")
+        for r in resultats:
+            memoire = "-" if r["memoire_octets"] is None else f"{r['memoire_octets'] / 2**20:.1f}"
+            print(f"{r['operation']:<24}{r['taille']:>8}{r['secondes']:>12.4f}{r['cellules_par_s']:>14.0f}{memoire:>14}")
+        exposants = scaling(resultats)
+        print()
+        for nom, exposant in exposants.items():
+            print(f"{nom:<24} temps ~ cellules^{'?' if exposant is None else f'{exposant:.2f}'}")
+        if args.json:
+            with open(args.json, "w") as f:
+                json.dump({"resultats": resultats, "exposants": exposants}, f, indent=1)
+        if not args.no_baseline:
+            with open(args.baseline) as f:
+                reference = json.load(f)["resultats"]
+            communes = {r["taille"] for r in reference} & set(tailles or [10, 100, 500, 1000, 2000])
+            print()
+            print(f"comparaison à {args.baseline} (tailles {sorted(communes) or 'aucune en commun'}, tolérance x{args.tolerance})")
+            trouvees = regressions(resultats, reference, args.tolerance)
+            for ligne in trouvees:
+                print("RÉGRESSION :", ligne)
+            if trouvees:
+                sys.exit(1)
+            print("aucune régression")
+    elif bench == "steps":
+        print(f"{'taille':>8}{'chemin':>10}{'dfs':>10}{'main droite':>13}{'trémaux':>10}{'comblées':>10}")
+        for r in bench_steps(tailles or [10, 50, 100, 300]):
+            print(f"{r['taille']:>8}{r['chemin']:>10.0f}{r['solve_dfs']:>10.0f}{r['solve_rhr']:>13.0f}"
+                  f"{r['solve_tremaux']:>10.0f}{r['solve_dead_end_filling']:>10.0f}")
+    elif bench == "service":
+        print(f"{'clients':>8}{'p50 (ms)':>10}{'p99 (ms)':>10}{'req/s':>9}{'hits':>7}{'calculs':>9}{'regroupées':>12}")
+        for r in bench_service(tailles or [1, 8, 32, 128]):
+            print(f"{r['clients']:>8}{r['p50_s'] * 1000:>10.1f}{r['p99_s'] * 1000:>10.1f}{r['requetes_par_s']:>9.0f}"
+                  f"{r['hits']:>7}{r['misses']:>9}{r['coalesced']:>12}")
+    elif bench == "storage":
+        print(f"{'stockage':<10}{'taille':>8}{'construction (s)':>18}{'mémoire (Mo)':>14}{'ops/s':>12}")
+        for r in compare_storage(tailles or [100, 1000, 4000]):
+            print(f"{r['stockage']:<10}{r['taille']:>8}{r['construction_s']:>18.3f}"
+                  f"{r['memoire_octets'] / 2**20:>14.1f}{r['ops_par_s']:>12.0f}")
+    elif bench.startswith("gen_") and hasattr(BitMaze, bench):
+        print(f"{'taille':>8}{'secondes':>12}{'cellules/s':>14}")
+        for r in bench_generation(getattr(BitMaze, bench), tailles or [100, 500, 1000, 2000, 5000]):
+            print(f"{r['taille']:>8}{r['secondes']:>12.3f}{r['cellules_par_s']:>14.0f}")
+    elif bench == "batch":
+        print(f"{'processus':>10}{'secondes':>12}{'labys/s':>10}")
+        for r in bench_batch(tailles or [1, 2, 4, 8]):
+            print(f"{r['processus']:>10}{r['secondes']:>12.3f}{r['labyrinthes_par_s']:>10.1f}")
+    else:
+        sys.exit(f"benchmark inconnu : {bench}")
@@ -0,0 +1,183 @@
+"""
+Service asyncio de labyrinthes : génération, résolution et rendu pour des clients de jeu.
+
+- la génération et la résolution (calcul intensif) tournent dans un exécuteur, sans bloquer la boucle d'événements ;
+- les requêtes identiques en cours, de clé (algorithme, h, w, graine), sont regroupées : un seul calcul ;
+- les labyrinthes terminés et leurs solutions sont gardés dans un cache LRU de taille bornée.
+
+Utilisation : python serviceMaze.py [port]
+              puis GET /maze?algorithm=wilson&h=20&w=20&seed=7
+"""
+import asyncio
+import json
+import sys
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from random import getrandbits
+from urllib.parse import urlsplit, parse_qs
+
+from SAEMaze import BitMaze
+
+
+ALGORITHMS = ("btree", "sidewinder", "eller", "fusion", "exploration", "wilson")
+MAX_CELLS = 1 << 20
+
+
+def _compute(cle):
+    """
+    Calcul d'une requête, exécuté dans l'exécuteur : génère le labyrinthe, le résout de (0, 0) à (h-1, w-1)
+    et prépare son rendu avec la solution. La réponse JSON est encodée ici aussi, hors de la boucle d'événements.
+
+    Paramètres: cle : (algorithme, h, w, graine).
+
+    Valeur de retour : (dict, bytes) : le résultat et son encodage JSON.
+    """
+    algorithm, h, w, seed = cle
+    laby = getattr(BitMaze, "gen_" + algorithm)(h, w, seed=seed)
+    solution = laby.solve_bfs((0, 0), (h - 1, w - 1))
+    resultat = {"algorithm": algorithm, "height": h, "width": w, "seed": seed,
+                "maze": str(laby), "solution": solution,
+                "overlay": laby.overlay({c: "*" for c in solution})}
+    return resultat, json.dumps(resultat).encode()
+
+
+class MazeService:
+    """
+    Front asynchrone des labyrinthes : get() est une coroutine qui ne bloque jamais la boucle d'événements.
+    Les compteurs hits (cache), misses (calculs lancés) et coalesced (requêtes jointes à un calcul en cours)
+    permettent de suivre son fonctionnement.
+    """
+    def __init__(self, cache_size=128, executor=None, workers=None):
+        """
+        Paramètres: cache_size : nombre de labyrinthes gardés en cache.
+                    executor : exécuteur des calculs (par défaut un ProcessPoolExecutor de workers processus).
+                    workers : nombre de processus de l'exécuteur par défaut (None : un par cœur).
+        """
+        self.cache_size = cache_size
+        if executor is None:
+            # processus lancés par « spawn » : un processus obtenu par fork hériterait des connexions ouvertes
+            # du serveur, que les clients verraient alors rester ouvertes
+            executor = ProcessPoolExecutor(workers, mp_context=get_context("spawn"))
+        self.executor = executor
+        self._cache = OrderedDict()      # clé -> (résultat, JSON encodé), du moins au plus récemment utilisé
+        self._inflight = {}              # clé -> calcul en cours (asyncio.Future)
+        self.hits = self.misses = self.coalesced = 0
+
+    def close(self):
+        """
+        Arrête l'exécuteur.
+        """
+        self.executor.shutdown()
+        return None
+
+    async def get(self, algorithm, h, w, seed=None):
+        """
+        Retourne le labyrinthe (algorithm, h, w, seed), sa solution et son rendu : depuis le cache,
+        en rejoignant un calcul identique en cours, ou en lançant le calcul dans l'exécuteur.
+
+        Paramètres: algorithm : nom de l'algorithme de génération.
+                    h, w : dimensions du labyrinthe.
+                    seed : graine (None : tirée au hasard, le résultat indique laquelle).
+
+        Valeur de retour : dict : le résultat (voir _compute).
+        """
+        return (await self._get(algorithm, h, w, seed))[0]
+
+    async def _get(self, algorithm, h, w, seed):
+        # (résultat, JSON encodé) : les paramètres viennent de clients non fiables, ils sont vérifiés
+        # par des exceptions (et non des assert, supprimés par python -O)
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Erreur lors de la requête : algorithme {algorithm} inconnu")
+        if not (0 < h and 0 < w and h * w <= MAX_CELLS):
+            raise ValueError(f"Erreur lors de la requête : dimensions {h} x {w} invalides")
+        cle = (algorithm, h, w, getrandbits(64) if seed is None else seed)
+        if cle in self._cache:
+            self.hits += 1
+            self._cache.move_to_end(cle)
+            return self._cache[cle]
+        if cle in self._inflight:
+            self.coalesced += 1
+            # shield : l'annulation d'un client n'annule pas le calcul partagé
+            return await asyncio.shield(self._inflight[cle])
+        self.misses += 1
+        calcul = asyncio.get_running_loop().run_in_executor(self.executor, _compute, cle)
+        self._inflight[cle] = calcul
+        try:
+            resultat = await asyncio.shield(calcul)
+        finally:
+            del self._inflight[cle]
+        self._cache[cle] = resultat
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return resultat
+
+    async def handle(self, reader, writer):
+        """
+        Traite une connexion HTTP/1.0 minimale : GET /maze?algorithm=...&h=...&w=...[&seed=...], réponse JSON.
+        """
+        try:
+            ligne = (await reader.readline()).decode("latin-1").split()
+            while (await reader.readline()).strip():
+                pass                      # en-têtes ignorés
+            if len(ligne) < 2 or ligne[0] != "GET" or urlsplit(ligne[1]).path != "/maze":
+                statut, corps = "404 Not Found", {"error": "GET /maze attendu"}
+            else:
+                params = {k: v[-1] for k, v in parse_qs(urlsplit(ligne[1]).query).items()}
+                try:
+                    seed = int(params["seed"]) if "seed" in params else None
+                    h, w = int(params["h"]), int(params["w"])
+                except (KeyError, ValueError) as erreur:
+                    statut, corps = "400 Bad Request", {"error": f"paramètre manquant ou invalide : {erreur}"}
+                else:
+                    try:
+                        # réponse déjà encodée (dans l'exécuteur, puis gardée en cache) : rien à sérialiser ici
+                        statut, donnees = "200 OK", (await self._get(params.get("algorithm", "wilson"), h, w, seed))[1]
+                    except ValueError as erreur:
+                        statut, corps = "400 Bad Request", {"error": str(erreur)}
+                    except Exception as erreur:
+                        statut, corps = "500 Internal Server Error", {"error": repr(erreur)}
+            if statut != "200 OK":
+                donnees = json.dumps(corps).encode()
+            writer.write(f"HTTP/1.0 {statut}\r\nContent-Type: application/json\r\n"
+                         f"Content-Length: {len(donnees)}\r\nConnection: close\r\n\r\n".encode() + donnees)
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def serve(self, host="127.0.0.1", port=8000):
+        """
+        Démarre le serveur HTTP (port 0 : un port libre est choisi).
+
+        Valeur de retour : asyncio.Server : le serveur ; server.sockets[0].getsockname()[1] donne le port.
+        """
+        return await asyncio.start_server(self.handle, host, port)
+
+
+async def fetch(host, port, algorithm="wilson", h=10, w=10, seed=None):
+    """
+    Client local : envoie une requête au service et retourne (statut HTTP, réponse JSON décodée).
+    """
+    requete = f"/maze?algorithm={algorithm}&h={h}&w={w}" + ("" if seed is None else f"&seed={seed}")
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(f"GET {requete} HTTP/1.0\r\nHost: {host}\r\n\r\n".encode())
+    await writer.drain()
+    reponse = await reader.read()
+    writer.close()
+    entete, _, corps = reponse.partition(b"\r\n\r\n")
+    return int(entete.split()[1]), json.loads(corps)
+
+
+async def main(port):
+    service = MazeService()
+    serveur = await service.serve(port=port)
+    print(f"service de labyrinthes sur http://127.0.0.1:{serveur.sockets[0].getsockname()[1]}/maze")
+    try:
+        async with serveur:
+            await serveur.serve_forever()
+    finally:
+        service.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 8000))
@@ -1,4 +1,11 @@
-from SAEMaze import Maze
+import asyncio
+import io
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from SAEMaze import Maze, BitMaze, UnionFind, TiledMaze, HPAIndex, Connectivity
+from serviceMaze import MazeService, fetch
 
 
 laby = Maze(4, 4, True)
@@ -207,13 +214,15 @@ print()
 print("==========DEBUT RESOLUTION MAIN DROITE==========")
 print()
 
-print("SKIPPED")
-#laby = Maze.gen_exploration(15, 15)
-#solution = laby.solve_rhr((0, 0), (14, 14))
+laby = Maze.gen_exploration(15, 15)
+solution = laby.solve_rhr((0, 0), (14, 14))
 str_solution = {c:'*' for c in solution}
 str_solution[( 0,  0)] = 'D'
 str_solution[(14, 14)] = 'A'
-#print(laby.overlay(str_solution))
+print(laby.overlay(str_solution))
+print(solution == laby.solve_bfs((0, 0), (14, 14)))
+marche = laby.solve_rhr((0, 0), (14, 14), raw=True)
+print(len(marche) - 1 == laby.expanded, marche[0], marche[-1])
 
 print()
 print("==========FIN RESOLUTION MAIN DROITE==========")
@@ -223,8 +232,8 @@ print()
 print("==========DEBUT EVALUATION==========")
 print()
 
-print(laby.distance_geo((0,0), (14,14))) 
-print(laby.distance_man((0,0), (14,14)))
+print(f"La distance Géodésique du labyrinthe est : {laby.distance_geo((0,0), (14,14))}")
+print(f"La distance de Manhattan du labyrinthe est : {laby.distance_man((0,0), (14,14))}")
 
 test = Maze.gen_wilson(15, 15)
 print(test)
@@ -234,7 +243,377 @@ print("==========FIN EVALUATION==========")
 print()
 
 
+print("==========DEBUT TEST STOCKAGE COMPACT==========")
+print()
+
+laby = BitMaze(4, 4, empty = True)
+laby.add_wall((0, 0), (0, 1))
+laby.add_wall((0, 1), (1, 1))
+print(laby)
+print(laby.get_walls())
+print(laby.get_reachable_cells((0, 1)))
+print(laby.neighbors[(0, 1)])
+
+laby = BitMaze.gen_fusion(15, 15)
+print(laby.overlay({c:'*' for c in laby.solve_dfs((0, 0), (14, 14))}))
+
+print()
+print("==========FIN TEST STOCKAGE COMPACT==========")
+print()
+
+
+print("==========DEBUT TEST UNION FIND==========")
+print()
+
+classes = UnionFind(6)
+print(classes.union(0, 1), classes.union(1, 2), classes.union(2, 0))
+print(classes.connected(0, 2), classes.connected(0, 3), classes.count)
+
+print()
+print("==========FIN TEST UNION FIND==========")
+print()
+
+
+print("==========DEBUT TEST GEN ELLER ET FLUX DE LIGNES==========")
+print()
+
+laby = Maze.gen_eller(8, 8)
+print(laby)
+
+for row in Maze.stream_sidewinder(8, 3):
+    print(list(row))
+
+laby = BitMaze.from_rows(3, 8, Maze.stream_eller(8, 3))
+print(laby)
+
+print()
+print("==========FIN TEST GEN ELLER ET FLUX DE LIGNES==========")
+print()
+
+
+print("==========DEBUT RESOLUTION BFS MULTI-CIBLES==========")
+print()
+
+laby = Maze(6, 6, empty = True)
+laby.add_wall((0, 0), (1, 0))
+print(laby.solve_bfs((0, 0), (1, 0)))
+print(laby.solve_bfs((0, 0), [(5, 5), (3, 0), (0, 5)]))
+print(laby.distance_geo((0, 0), (5, 5)))
+
+print()
+print("==========FIN RESOLUTION BFS MULTI-CIBLES==========")
+print()
+
+
+print("==========DEBUT RESOLUTION A* ET BIDIRECTIONNELLE==========")
+print()
+
+laby = Maze.gen_exploration(15, 15)
+solution = laby.solve_astar((0, 0), (14, 14))
+print(len(solution), laby.expanded)
+solution = laby.solve_bidir((0, 0), (14, 14))
+print(len(solution), laby.expanded)
+str_solution = {c:'*' for c in solution}
+str_solution[( 0,  0)] = 'D'
+str_solution[(14, 14)] = 'A'
+print(laby.overlay(str_solution))
+
+print()
+print("==========FIN RESOLUTION A* ET BIDIRECTIONNELLE==========")
+print()
+
+
+print("==========DEBUT TEST INDEX D'ARBRE==========")
+print()
+
+laby = Maze.gen_wilson(15, 15)
+index = laby.build_index()
+print(laby.distance_geo((0, 0), (14, 14)), len(laby.solve_bfs((0, 0), (14, 14))) - 1)
+print(index.lca((0, 14), (14, 0)))
+print(laby.overlay({c:'*' for c in index.path((0, 14), (14, 0))}))
+autre = laby.build_index((14, 14))
+print(autre is not index, autre.root == 14*15 + 14, laby.build_index() is index)
+print(autre.distance((0, 14), (14, 0)) == index.distance((0, 14), (14, 0)))
+
+print()
+print("==========FIN TEST INDEX D'ARBRE==========")
+print()
+
+
+print("==========DEBUT TEST ECRITURE LIGNE PAR LIGNE==========")
+print()
+
+laby = Maze.gen_sidewinder(5, 5)
+laby.write(sys.stdout, {(0, 0): 'D', (4, 4): 'A'})
+
+print()
+print("==========FIN TEST ECRITURE LIGNE PAR LIGNE==========")
+print()
+
+
+print("==========DEBUT TEST SAUVEGARDE ET CHARGEMENT==========")
+print()
+
+laby = Maze.gen_fusion(6, 6)
+laby.save("laby_test.maze")
+with Maze.load("laby_test.maze", lazy=True) as charge:
+    print(charge.generator, charge.height, charge.width)
+    print(charge.get_reachable_cells((2, 2)), laby.get_reachable_cells((2, 2)))
+    print(charge)
+    try:
+        charge.remove_wall((0, 0), (0, 1))
+    except OSError as erreur:
+        print(type(erreur).__name__, erreur)
+charge = Maze.load("laby_test.maze")
+print(type(charge).__name__, str(charge) == str(laby))
+print(BitMaze.load("laby_test.maze"))
+os.remove("laby_test.maze")
+
+print()
+print("==========FIN TEST SAUVEGARDE ET CHARGEMENT==========")
+print()
+
+
+print("==========DEBUT TEST GENERATION PAR LOTS==========")
+print()
+
+lot = Maze.generate_many("exploration", 5, 5, 3, seed=42, workers=1)
+print(lot == Maze.generate_many("exploration", 5, 5, 3, seed=42, workers=2))
+for bits in lot:
+    print(Maze.from_bits(5, 5, bits))
+
+print()
+print("==========FIN TEST GENERATION PAR LOTS==========")
+print()
+
+
+print("==========DEBUT TEST GRAINES==========")
+print()
+
+laby = Maze.gen_wilson(6, 6, seed=2023)
+print(laby.seed)
+print(laby)
+print(str(laby) == str(Maze.gen_wilson(6, 6, seed=2023)))
+laby = Maze.gen_exploration(6, 6)
+print(str(laby) == str(Maze.gen_exploration(6, 6, seed=laby.seed)))
+
+print()
+print("==========FIN TEST GRAINES==========")
+print()
+
+
+print("==========DEBUT TEST MONDE EN BLOCS==========")
+print()
+
+monde = TiledMaze(10**6, 10**6, chunk=8, seed=7, cache_size=32)
+print(monde.get_reachable_cells((7, 7)), monde.get_reachable_cells((8, 8)))
+chemin = monde.solve((0, 0), (20, 30))
+print(len(chemin), chemin[0], chemin[-1])
+print(monde.distance_geo((0, 0), (20, 30)))
+
+print()
+print("==========FIN TEST MONDE EN BLOCS==========")
+print()
+
+
+print("==========DEBUT TEST INDEX HIERARCHIQUE==========")
+print()
+
+laby = Maze.gen_wilson(15, 15, seed=15)
+index = HPAIndex(laby, 5)
+print(len(index.solve((0, 0), (14, 14))) == len(laby.solve_bfs((0, 0), (14, 14))))
+print((6, 5) in laby.get_reachable_cells((6, 4)), (10, 11) in laby.get_reachable_cells((9, 11)))
+longueur = len(laby.solve_bfs((0, 0), (14, 14)))
+laby.remove_wall((6, 4), (6, 5))
+laby.remove_wall((9, 11), (10, 11))
+print(len(laby.solve_bfs((0, 0), (14, 14))) < longueur)
+print(len(index.solve((0, 0), (14, 14))) == len(laby.solve_bfs((0, 0), (14, 14))))
+print(index.edges == HPAIndex(laby, 5).edges)
+
+print()
+print("==========FIN TEST INDEX HIERARCHIQUE==========")
+print()
+
+
+print("==========DEBUT TEST CONNEXITE==========")
+print()
+
+laby = Maze.gen_fusion(6, 6, seed=16)
+suivi = Connectivity(laby)
+print(suivi.is_perfect(), suivi.components(), suivi.cycles())
+print((1, 1) in laby.get_reachable_cells((0, 1)))
+laby.remove_wall((0, 1), (1, 1))
+print(suivi.is_perfect(), suivi.components(), suivi.cycles())
+laby.add_wall((0, 1), (1, 1))
+laby.add_wall((0, 0), (0, 1))
+laby.add_wall((0, 0), (1, 0))
+print(suivi.is_connected((0, 0), (5, 5)), suivi.is_connected((0, 1), (5, 5)))
+print(suivi.is_perfect(), suivi.components(), suivi.cycles())
+
+print()
+print("==========FIN TEST CONNEXITE==========")
+print()
+
+
+print("==========DEBUT TEST STATISTIQUES==========")
+print()
+
+laby = Maze.gen_wilson(5, 5, seed=3)
+print(laby)
+stats = laby.stats()
+print(stats["impasses"], stats["couloirs"], stats["carrefours"], stats["couloirs_droits"])
+print(stats["longueur_solution"], stats["excentricite"], stats["diametre"], stats["plus_long_chemin"])
+print(stats["longueur_solution"] == laby.distance_geo((0, 0), (4, 4)))
+stats["impasses"] = -1
+stats["couloirs_droits"].clear()
+print(laby.stats()["impasses"], laby.stats()["couloirs_droits"])
+
+print()
+print("==========FIN TEST STATISTIQUES==========")
+print()
+
+
+print("==========DEBUT TEST INSTRUMENTATION==========")
+print()
+
+operations = []
+with Maze.instrument(lambda operation, compteurs, durees: operations.append(operation)) as sonde:
+    laby = Maze.gen_wilson(10, 10, seed=19)
+    laby.solve_bfs((0, 0), (9, 9))
+    laby.remove_wall((0, 0), (0, 1))
+print(operations)
+print(sonde.counts["gen_wilson.murs_casses"], sonde.counts["remove_wall.appels"], sorted(sonde.times))
+print(sonde.counts["gen_wilson.tirages"] >= sonde.counts["gen_wilson.pas"], sonde.counts["gen_wilson.effacements"])
+laby.add_wall((0, 0), (0, 1))
+print(sonde.counts["add_wall.appels"])
+with Maze.instrument() as sonde:
+    fil = threading.Thread(target=Maze.gen_wilson, args=(10, 10))
+    fil.start()
+    fil.join()
+    Maze.gen_exploration(10, 10, seed=19)
+print(sorted(sonde.counts))
+print(sonde.counts["gen_exploration.empilements"], sonde.counts["gen_exploration.tirages"] >= 99)
+
+print()
+print("==========FIN TEST INSTRUMENTATION==========")
+print()
+
+
+print("==========DEBUT TEST TREMAUX ET CULS-DE-SAC==========")
+print()
+
+laby = Maze.gen_wilson(12, 12, seed=20)
+solution = laby.solve_bfs((0, 0), (11, 11))
+print(laby.solve_tremaux((0, 0), (11, 11)) == solution, laby.expanded)
+print(laby.solve_dead_end_filling((0, 0), (11, 11)) == solution, laby.expanded)
+
+print()
+print("==========FIN TEST TREMAUX ET CULS-DE-SAC==========")
+print()
+
+
+print("==========DEBUT TEST VOISINAGES IMPLICITES==========")
+print()
+
+grand = Maze(5000, 5000, empty=True)
+grand.add_wall((0, 0), (0, 1))
+print(len(grand.neighbors.edited), grand.get_reachable_cells((0, 0)), grand.get_reachable_cells((2500, 2500)))
+grand.fill()
+print(len(grand.neighbors.edited), grand.get_reachable_cells((2500, 2500)))
+laby = Maze(3, 3, empty=True)
+print(str(laby) == str(BitMaze(3, 3, empty=True)), laby.get_walls())
+laby = Maze.gen_btree(50, 50, seed=6)
+print(len(laby.neighbors.edited), laby.neighbors[(7, 7)] == set(BitMaze.gen_btree(50, 50, seed=6).get_reachable_cells((7, 7))))
+laby.add_wall((7, 7), sorted(laby.neighbors[(7, 7)])[0])
+print(len(laby.neighbors.edited))
+laby = Maze(2, 2, True)
+print(laby.solve_bfs((0, 0), (0, 1)))
+laby.neighbors[(0, 0)].discard((0, 1))
+laby.neighbors[(0, 1)].discard((0, 0))
+print(laby.get_reachable_cells((0, 0)), laby.solve_bfs((0, 0), (0, 1)))
+print(laby)
+
+print()
+print("==========FIN TEST VOISINAGES IMPLICITES==========")
+print()
+
+
+print("==========DEBUT TEST MURS COMPACTS==========")
+print()
+
+laby = Maze.gen_fusion(3, 3, seed=22)
+print(laby)
+print(laby.wall_ids())
+print(list(laby.iter_walls()) == laby.get_walls(), [laby.wall_cells(e) for e in laby.wall_ids()] == laby.get_walls())
+print(sorted(laby.shuffled_walls(seed=1)) == list(laby.wall_ids()))
+
+print()
+print("==========FIN TEST MURS COMPACTS==========")
+print()
 
 
+print("==========DEBUT TEST SERVICE==========")
+print()
+
+async def scenario():
+    service = MazeService(cache_size=2, executor=ThreadPoolExecutor(2))
+    a, b = await asyncio.gather(service.get("wilson", 8, 8, 23), service.get("wilson", 8, 8, 23))
+    print(a is b, service.misses, service.coalesced)
+    await service.get("wilson", 8, 8, 23)
+    print(service.hits, a["solution"][0], a["solution"][-1])
+    serveur = await service.serve(port=0)
+    port = serveur.sockets[0].getsockname()[1]
+    statut, reponse = await fetch("127.0.0.1", port, "exploration", 5, 5, seed=1)
+    print(statut, reponse["maze"] == str(Maze.gen_exploration(5, 5, seed=1)))
+    print((await fetch("127.0.0.1", port, "inconnu", 5, 5))[0], (await fetch("127.0.0.1", port, "wilson", 10**5, 10**5))[0])
+    serveur.close()
+    await serveur.wait_closed()
+    service.close()
+
+asyncio.run(scenario())
+
+print()
+print("==========FIN TEST SERVICE==========")
+print()
 
 
+print("==========DEBUT TEST EXPORT IMAGE==========")
+print()
+
+laby = Maze.gen_wilson(3, 4, seed=1)
+print(laby)
+image = io.BytesIO()
+laby.write_image(image, cell=1, wall=1, path=laby.solve_bfs((0, 0), (2, 3)), format="pgm")
+entete, _, pixels = image.getvalue().partition(b"255\n")
+print(entete)
+for r in range(7):
+    print("".join({0: "#", 255: ".", 128: "*"}[p] for p in pixels[9*r:9*(r+1)]))
+image = io.BytesIO()
+BitMaze.gen_sidewinder(30, 40, seed=2).write_image(image, cell=3, wall=1)
+print(image.getvalue()[:8] == b"\x89PNG\r\n\x1a\n", image.getvalue()[-8:-4] == b"IEND")
+
+print()
+print("==========FIN TEST EXPORT IMAGE==========")
+print()
+
+
+print("==========DEBUT TEST CHAMP DE DISTANCES==========")
+print()
+
+laby = Maze.gen_wilson(6, 8, seed=4)
+print(laby)
+sorties = [(0, 0), (5, 7)]
+dist, dirs = laby.distance_field(sorties)
+for i in range(6):
+    print(" ".join(f"{dist[i*8 + j]:2}" for j in range(8)))
+agent, pas = (3, 4), 0
+while laby.next_step(agent, sorties) is not None:
+    agent, pas = laby.next_step(agent, sorties), pas + 1
+print(agent in sorties, pas == dist[3*8 + 4])
+print(laby.distance_field(list(reversed(sorties)))[0] is dist)
+laby.add_wall((0, 0), (0, 1))
+print(laby.distance_field(sorties)[0] is dist)
+
+print()
+print("==========FIN TEST CHAMP DE DISTANCES==========")
+print()